@@ -0,0 +1,181 @@
+import os
+import struct
+import threading
+import pygame
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+PACK_MAGIC: bytes = b"TAPK"
+PACK_VERSION: int = 2  # 2: 改為純資料格式（不再使用 pickle，讀取快取不會執行任何程式碼）
+
+# 包檔中每張圖片的內容：(來源修改時間, 目標尺寸, 像素格式, 像素資料)
+PackEntry = Tuple[int, Tuple[int, int], str, bytes]
+
+_PACK_HEADER = struct.Struct("<4sBI")  # 魔術字、版本、圖片數
+# 每張圖片：名稱長度、來源修改時間、寬、高、像素格式長度、像素資料長度，之後接名稱、格式與像素資料
+_ENTRY_HEADER = struct.Struct("<HqHHBI")
+
+
+def encode_pack(entries: Dict[str, PackEntry]) -> bytes:
+    """
+    將圖片快取編碼成包檔內容。
+    """
+    chunks = [_PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(entries))]
+    for name, (mtime, (width, height), mode, data) in entries.items():
+        name_bytes, mode_bytes = name.encode(), mode.encode("ascii")
+        chunks.append(_ENTRY_HEADER.pack(len(name_bytes), mtime, width, height, len(mode_bytes), len(data)))
+        chunks += [name_bytes, mode_bytes, data]
+    return b"".join(chunks)
+
+
+def decode_pack(data: bytes) -> Dict[str, PackEntry]:
+    """
+    解析包檔內容。
+    :raises ValueError: 格式、版本不符或內容被截斷
+    """
+    try:
+        magic, version, count = _PACK_HEADER.unpack_from(data)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"not a version {PACK_VERSION} asset pack")
+        offset = _PACK_HEADER.size
+        entries: Dict[str, PackEntry] = {}
+        for _ in range(count):
+            name_length, mtime, width, height, mode_length, data_length = _ENTRY_HEADER.unpack_from(data, offset)
+            offset += _ENTRY_HEADER.size
+            end = offset + name_length + mode_length + data_length
+            if end > len(data):
+                raise ValueError("truncated asset pack")
+            name = data[offset:offset + name_length].decode()
+            offset += name_length
+            mode = data[offset:offset + mode_length].decode("ascii")
+            offset += mode_length
+            entries[name] = (mtime, (width, height), mode, data[offset:end])
+            offset = end
+    except (struct.error, UnicodeDecodeError) as error:
+        raise ValueError(f"malformed asset pack: {error}") from error
+    return entries
+
+
+class AssetPack(Mapping):
+    """
+    將縮放後的圖片烘焙成單一快取包檔，並在執行期轉成顯示格式。
+    包檔以來源檔的修改時間與目標尺寸為鍵，來源或尺寸改變時只重建該張圖片。
+    關鍵圖片同步載入，其餘圖片由背景執行緒解碼，第一次取用時才轉成顯示格式。
+    """
+
+    def __init__(self, image_paths: Dict[str, str], sizes: Dict[str, Tuple[int, int]], pack_path: str) -> None:
+        """
+        :param image_paths: 圖片名稱與來源路徑
+        :param sizes: 圖片名稱與縮放後的尺寸
+        :param pack_path: 快取包檔的路徑
+        """
+        self.image_paths: Dict[str, str] = image_paths
+        self.sizes: Dict[str, Tuple[int, int]] = sizes
+        self.pack_path: str = pack_path
+        self._entries: Dict[str, PackEntry] = {}
+        self._decoded: Dict[str, pygame.Surface] = {}
+        self._converted: Dict[str, pygame.Surface] = {}
+        self._errors: Dict[str, Exception] = {}  # 解碼失敗的圖片與其錯誤，取用時再拋出
+        self._ready: Dict[str, threading.Event] = {name: threading.Event() for name in image_paths}
+        self._stale: bool = False
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self, critical: Iterable[str] = ()) -> "AssetPack":
+        """
+        讀取包檔並同步解碼關鍵圖片，其餘圖片交給背景執行緒。
+        """
+        self._entries = self._read_pack()
+        critical = [name for name in critical if name in self.image_paths]
+        for name in critical:
+            self._decode(name)
+        rest = [name for name in self.image_paths if name not in critical]
+        self._thread = threading.Thread(target=self._load_rest, args=(rest,), daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self) -> None:
+        """
+        等待背景載入（與包檔寫回）完成。
+        """
+        if self._thread is not None:
+            self._thread.join()
+
+    def __getitem__(self, name: str) -> pygame.Surface:
+        """
+        取得已轉成顯示格式的圖片；背景執行緒尚未解碼完成時會等待。
+        :raises OSError: 來源檔不存在或無法讀取
+        :raises pygame.error: 來源檔無法解碼
+        """
+        surface = self._converted.get(name)
+        if surface is None:
+            if name not in self._ready:
+                raise KeyError(name)
+            self._ready[name].wait()
+            if name in self._errors:
+                raise self._errors[name]
+            decoded = self._decoded[name]
+            # 轉換必須在主執行緒（擁有顯示畫面）進行
+            surface = decoded.convert_alpha() if decoded.get_flags() & pygame.SRCALPHA else decoded.convert()
+            self._converted[name] = surface
+        return surface
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.image_paths)
+
+    def __len__(self) -> int:
+        return len(self.image_paths)
+
+    def _load_rest(self, names: Iterable[str]) -> None:
+        for name in names:
+            self._decode(name)
+        if self._stale:
+            self._write_pack()
+
+    def _decode(self, name: str) -> None:
+        """
+        解碼一張圖片；失敗時記下錯誤。無論成功與否都會標記完成，避免取用端永遠等待，
+        背景執行緒也一定會處理完其餘的圖片。
+        """
+        try:
+            self._decoded[name] = self._decode_surface(name)
+        except Exception as error:
+            self._errors[name] = error
+        finally:
+            self._ready[name].set()
+
+    def _decode_surface(self, name: str) -> pygame.Surface:
+        """
+        從包檔還原圖片；包檔沒有、已過期或內容損壞時由來源檔載入並縮放。
+        """
+        path, size = self.image_paths[name], tuple(self.sizes[name])
+        mtime = os.stat(path).st_mtime_ns
+        entry = self._entries.get(name)
+        surface = None
+        if entry is not None and entry[0] == mtime and entry[1] == size:
+            try:
+                surface = pygame.image.frombytes(entry[3], size, entry[2])
+            except (ValueError, TypeError, pygame.error):
+                pass  # 快取隨時可以丟棄，當作沒有命中
+        if surface is None:
+            surface = pygame.transform.scale(pygame.image.load(path), size)
+            mode = "RGBA" if surface.get_flags() & pygame.SRCALPHA else "RGB"
+            self._entries[name] = (mtime, size, mode, pygame.image.tobytes(surface, mode))
+            self._stale = True
+        return surface
+
+    def _read_pack(self) -> Dict[str, PackEntry]:
+        try:
+            with open(self.pack_path, "rb") as file:
+                return decode_pack(file.read())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_pack(self) -> None:
+        temp_path = f"{self.pack_path}.tmp"
+        entries = {name: self._entries[name] for name in self.image_paths if name in self._entries}
+        try:
+            with open(temp_path, "wb") as file:
+                file.write(encode_pack(entries))
+            os.replace(temp_path, self.pack_path)
+        except OSError as error:
+            print(f"Error: Could not write asset pack at {self.pack_path}: {error}")
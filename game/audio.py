@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+import pygame
+from typing import Dict, List, Optional
+
+
+class AudioManager:
+    """
+    音效管理：背景執行緒解碼音效，並以固定的保留聲道池播放。
+    mixer 無法初始化或檔案不存在時一律靜音略過，不影響遊戲進行。
+    """
+
+    def __init__(self, sound_paths: Dict[str, str], pool_size: int = 4, min_interval: float = 0.05) -> None:
+        """
+        :param sound_paths: 音效名稱與檔案路徑
+        :param pool_size: 保留給音效的聲道數，全部忙碌時中斷最早開始的聲音
+        :param min_interval: 同一音效兩次播放的最短間隔（秒），過密的呼叫會被略過
+        """
+        self.sound_paths: Dict[str, str] = sound_paths
+        self.min_interval: float = min_interval
+        self.sounds: Dict[str, pygame.mixer.Sound] = {}
+        self.enabled: bool = self._init_mixer()
+        self._channels: List[pygame.mixer.Channel] = []
+        self._started: List[float] = []  # 每個聲道最近一次開始播放的時間
+        self._last_played: Dict[str, float] = {}
+        self._thread: Optional[threading.Thread] = None
+        if self.enabled:
+            pool_size = pygame.mixer.set_reserved(pool_size)  # 保留的聲道不會被 Sound.play() 自動選用
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), pool_size))
+            self._channels = [pygame.mixer.Channel(index) for index in range(pool_size)]
+            self._started = [0.0] * pool_size
+
+    @staticmethod
+    def _init_mixer() -> bool:
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        except pygame.error as error:
+            print(f"Error: Audio disabled: {error}")
+            return False
+        return True
+
+    def load(self) -> "AudioManager":
+        """
+        在背景執行緒解碼所有音效；解碼完成前呼叫 play() 只會略過。
+        """
+        if self.enabled:
+            self._thread = threading.Thread(target=self._load_all, daemon=True)
+            self._thread.start()
+        return self
+
+    def wait(self) -> None:
+        """
+        等待背景解碼完成。
+        """
+        if self._thread is not None:
+            self._thread.join()
+
+    def _load_all(self) -> None:
+        for name, path in self.sound_paths.items():
+            if not os.path.exists(path):
+                print(f"Error: Sound file not found at {path}")
+                continue
+            try:
+                self.sounds[name] = pygame.mixer.Sound(path)
+            except pygame.error as error:
+                print(f"Error: Could not load sound {path}: {error}")
+
+    def play(self, name: str) -> None:
+        """
+        在聲道池中播放音效：優先使用空閒聲道，全部忙碌時中斷最早開始的聲道。
+        """
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        now = time.perf_counter()
+        if now - self._last_played.get(name, -self.min_interval) < self.min_interval:
+            return
+        self._last_played[name] = now
+        index = next(
+            (index for index, channel in enumerate(self._channels) if not channel.get_busy()),
+            min(range(len(self._channels)), key=self._started.__getitem__)
+        )
+        self._channels[index].play(sound)
+        self._started[index] = now
+
+    def play_music(self, path: str, volume: float = 0.5) -> None:
+        """
+        循環播放背景音樂（串流播放，不需要預先解碼）。
+        """
+        if not self.enabled:
+            return
+        if not os.path.exists(path):
+            print(f"Error: Music file not found at {path}")
+            return
+        try:
+            pygame.mixer.music.load(path)
+        except pygame.error as error:
+            print(f"Error: Could not load music {path}: {error}")
+            return
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(-1)
@@ -0,0 +1,200 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from board import BOARD_X, BOARD_Y, TileManager
+from grid import HAS_NUMPY, StoneGrid
+from models import Runestone
+from stone_types import StoneType
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+SIZES: List[Tuple[int, int]] = [(5, 6), (20, 20), (50, 50), (200, 200)]
+QUICK_SIZES: List[Tuple[int, int]] = [(5, 6), (20, 20)]
+DENSITIES: List[float] = [1.0, 0.7, 0.3]  # 非空格子的比例
+TYPE_COUNTS: List[int] = [3, 5]  # 盤面使用的符石類型數
+TILE_SIZE: int = 100
+DRAG_STEPS: int = 50
+
+Tiles = List[List[Optional[Runestone]]]
+Case = Tuple[str, Callable[[], object], Callable[[object], object]]
+
+
+def random_tiles(rows: int, cols: int, density: float, types: int, rng: random.Random) -> Tiles:
+    """
+    建立指定填滿比例與類型數的隨機盤面（允許初始消除）。
+    """
+    stone_types = list(StoneType)[:types]
+    return [
+        [Runestone(rng.choice(stone_types)) if rng.random() < density else None for _ in range(cols)]
+        for _ in range(rows)
+    ]
+
+
+def drag_positions(rows: int, cols: int, rng: random.Random) -> List[Tuple[int, int]]:
+    """
+    產生一段隨機拖曳路徑的滑鼠座標（每步移到相鄰格子的中心）。
+    """
+    row, col = rng.randrange(rows), rng.randrange(cols)
+    positions = []
+    for _ in range(DRAG_STEPS + 1):
+        positions.append((col * TILE_SIZE + BOARD_X + TILE_SIZE // 2, row * TILE_SIZE + BOARD_Y + TILE_SIZE // 2))
+        d_row, d_col = rng.choice(((-1, 0), (1, 0), (0, -1), (0, 1)))
+        row, col = min(max(row + d_row, 0), rows - 1), min(max(col + d_col, 0), cols - 1)
+    return positions
+
+
+def _backends() -> List[str]:
+    return ["list", "grid"] if HAS_NUMPY else ["list"]
+
+
+def _as_backend(tiles: Tiles, backend: str):
+    return StoneGrid.from_tiles(tiles) if backend == "grid" else tiles
+
+
+def _drag(args) -> None:
+    tiles, positions, rows, cols = args
+    drag_path: List[Tuple[int, int]] = []
+    TileManager.handle_drag(tiles, positions[0], drag_path, rows, cols, TILE_SIZE)
+    for position in positions[1:]:
+        TileManager.continue_drag(tiles, position, drag_path, rows, cols, TILE_SIZE)
+
+
+def cases(sizes: List[Tuple[int, int]], seed: int = 0) -> Iterator[Case]:
+    """
+    列出所有基準案例：(名稱, 準備資料, 量測的操作)。準備資料不計入時間。
+    """
+    for rows, cols in sizes:
+        size = f"{rows}x{cols}"
+        yield (
+            f"generate_board/{size}",
+            lambda: random.Random(seed),
+            lambda rng, rows=rows, cols=cols: TileManager.generate_board(rows, cols, rng)
+        )
+        for backend in _backends():
+            yield (
+                f"has_initial_matches/{backend}/{size}",
+                lambda rows=rows, cols=cols, backend=backend: _as_backend(
+                    TileManager.generate_board(rows, cols, seed), backend
+                ),
+                TileManager.has_initial_matches
+            )
+            for types in TYPE_COUNTS:
+                for density in DENSITIES:
+                    label = f"{backend}/{size}/d{density:g}/t{types}"
+
+                    def setup(rows=rows, cols=cols, density=density, types=types, backend=backend):
+                        return _as_backend(random_tiles(rows, cols, density, types, random.Random(seed)), backend)
+
+                    yield f"check_matches/{label}", setup, TileManager.check_matches
+                    yield f"check_groups/{label}", setup, TileManager.check_groups
+                    yield (
+                        f"apply_gravity/{label}",
+                        lambda setup=setup: (setup(), random.Random(seed)),
+                        lambda args, rows=rows, cols=cols: TileManager.apply_gravity(args[0], rows, cols, args[1])
+                    )
+                yield (
+                    f"continue_drag/{backend}/{size}/t{types}/steps{DRAG_STEPS}",
+                    lambda rows=rows, cols=cols, types=types, backend=backend: (
+                        _as_backend(random_tiles(rows, cols, 1.0, types, random.Random(seed)), backend),
+                        drag_positions(rows, cols, random.Random(seed)), rows, cols
+                    ),
+                    _drag
+                )
+
+
+def measure(
+    setup: Callable[[], object], operation: Callable[[object], object], budget: float, min_runs: int
+) -> Dict[str, float]:
+    """
+    重複執行操作直到用完時間預算（至少 min_runs 次），每次都重新準備資料。
+    """
+    timings: List[float] = []
+    spent = 0.0
+    while len(timings) < min_runs or spent < budget:
+        data = setup()
+        started = time.perf_counter()
+        operation(data)
+        elapsed = time.perf_counter() - started
+        timings.append(elapsed)
+        spent += elapsed
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "runs": len(timings),
+    }
+
+
+def run(sizes: List[Tuple[int, int]], budget: float = 0.2, min_runs: int = 3, pattern: str = "") -> Dict[str, object]:
+    """
+    執行所有名稱包含 pattern 的案例，回傳可寫成 JSON 的結果。
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    for name, setup, operation in cases(sizes):
+        if pattern in name:
+            results[name] = measure(setup, operation, budget, min_runs)
+            print(f"{name:<55} {results[name]['median_s'] * 1000:10.3f} ms", file=sys.stderr)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": HAS_NUMPY,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], threshold: float) -> List[str]:
+    """
+    比較兩份結果的最短時間（受背景負載影響最小），回傳變慢超過 threshold（比例）的案例說明。
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or before["min_s"] <= 0:
+            continue
+        ratio = result["min_s"] / before["min_s"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {before['min_s'] * 1000:.3f} ms -> {result['min_s'] * 1000:.3f} ms ({ratio - 1:+.0%})"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Headless benchmarks for TileManager board operations.")
+    parser.add_argument("--output", "-o", help="write results as JSON to this path (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON to check for regressions")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="allowed slowdown ratio before flagging (default 0.10)"
+    )
+    parser.add_argument("--quick", action="store_true", help="only run the small board sizes")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this string")
+    parser.add_argument("--budget", type=float, default=0.2, help="seconds spent per case (default 0.2)")
+    args = parser.parse_args(argv)
+
+    current = run(QUICK_SIZES if args.quick else SIZES, args.budget, pattern=args.filter)
+    text = json.dumps(current, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(current, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.threshold:.0%}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
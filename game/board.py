@@ -1,22 +1,173 @@
 import random
-from models import Runestone
-from stone_types import StoneType
-import pygame
-from typing import List, Tuple, Optional
+import struct
+from itertools import starmap
+from models import STONES, Runestone, draw_stones
+from grid import StoneGrid
+from stone_types import TYPE_CODES, StoneType
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+try:
+    import pygame
+except ImportError:  # 無頭模擬（GameState）不需要 pygame，只有繪製時才用到
+    pygame = None
+
+BOARD_X: int = 50  # 盤面左上角在畫布上的 X 座標
+BOARD_Y: int = 300  # 盤面左上角在畫布上的 Y 座標
+EMPTY_BYTE: int = 0xFF  # 快照中空格的代碼
+CHECKPOINT_DRAWS: int = 256  # 亂數檢查點的間隔（補充符石數），還原時最多重抽這麼多顆
+
+
+class MatchGroup(NamedTuple):
+    """
+    一組相連的同類型消除格子（一個 combo）。
+    """
+    type: StoneType
+    cells: frozenset  # 群組內的格子座標
+    height: int  # 外接矩形的列數
+    width: int  # 外接矩形的行數
+
+    @property
+    def size(self) -> int:
+        return len(self.cells)
+
+    @property
+    def is_line(self) -> bool:
+        """
+        是否為單一直線（橫向或縱向），否則為 L、T、十字或並排等組合形狀。
+        """
+        return self.height == 1 or self.width == 1
+
+
+class RngCheckpoint(NamedTuple):
+    """
+    亂數產生器在某個位置的完整狀態，由之後的快照共用。
+    """
+    draws: int  # 檢查點所在的位置（重新生成盤面後已抽出的補充符石數）
+    state: Tuple[int, bytes, Optional[float]]  # random.Random.getstate()，內部狀態壓成 bytes
+
+
+class BoardSnapshot(NamedTuple):
+    """
+    盤面快照：每格一個位元組的類型代碼，加上亂數產生器的位置。
+    亂數位置以「最近的檢查點 + 之後抽出的數量」表示，多個快照共用同一個檢查點。
+    """
+    codes: bytes
+    draws: int  # 重新生成盤面後已抽出的補充符石數
+    checkpoint: RngCheckpoint
+
+
+class Fall(NamedTuple):
+    """
+    下落時一顆符石的移動。
+    """
+    col: int
+    from_row: int
+    to_row: int
+
+    @property
+    def distance(self) -> int:
+        return self.to_row - self.from_row
+
+
+class Spawn(NamedTuple):
+    """
+    補充到空格的新符石。
+    """
+    row: int
+    col: int
+    stone: Runestone
+
+
+class GravityResult(NamedTuple):
+    """
+    一次下落的結果，可直接用來播放下落動畫。
+    """
+    falls: List[Fall]  # 每顆移動的符石
+    spawns: List[Spawn]  # 每顆新補充的符石
+
+    @property
+    def changed(self) -> Set[Tuple[int, int]]:
+        """
+        內容有變動的格子（下落的目的地與補充的格子）。
+        """
+        return {(fall.to_row, fall.col) for fall in self.falls} | {(spawn.row, spawn.col) for spawn in self.spawns}
+
+
+class CascadeStep(NamedTuple):
+    """
+    連鎖消除中單一步驟的紀錄。
+    """
+    cleared: frozenset  # 本步驟消除的格子座標
+    combo: int  # 本步驟貢獻的連擊數（相連同類型群組的數量）
+    groups: Tuple[MatchGroup, ...] = ()  # 本步驟消除的各個群組
+    gravity: Optional[GravityResult] = None  # 消除後的下落與補充
 
 
 class Board:
-    def __init__(self, rows: int, cols: int, tile_size: int):
+    def __init__(
+        self, rows: int, cols: int, tile_size: int, compact: bool = False,
+        rng: Union[int, random.Random, None] = None
+    ):
         """
         初始化遊戲盤面參數。
+        :param compact: 是否使用 NumPy 精簡盤面（StoneGrid）儲存符石
+        :param rng: 生成與補充符石用的亂數種子或產生器（預設建立一個獨立的產生器）
         """
         self.rows: int = rows
         self.cols: int = cols
         self.tile_size: int = tile_size
-        self.tiles: List[List[Optional[Runestone]]] = TileManager.generate_board(rows, cols)
+        self.compact: bool = compact
+        self.rng: random.Random = TileManager.make_rng(rng)
+        self.tiles: Union[List[List[Optional[Runestone]]], StoneGrid] = []
         self.drag_path: List[Tuple[int, int]] = []
+        # 內容有變動、需要重新繪製的格子（由 BoardRenderer 取用後清空）
+        self.dirty: Set[Tuple[int, int]] = set()
+        self.calls: Dict[str, int] = {"check_matches": 0, "apply_gravity": 0}  # 累計呼叫次數（效能量測用）
+        # 快照只記錄亂數的位置（抽出幾顆補充符石），還原時由之前的檢查點重新抽到該位置
+        self.draws: int = 0
+        self._checkpoint: RngCheckpoint = RngCheckpoint(0, (0, b"", None))
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        重新生成盤面（沿用同一個 Board 物件與亂數產生器），並標記全部格子需要重畫。
+        """
+        self.tiles = TileManager.generate_board(self.rows, self.cols, self.rng)
+        if self.compact:
+            self.tiles = StoneGrid.from_tiles(self.tiles)
+        self.drag_path = []
+        self.dirty = {(row, col) for row in range(self.rows) for col in range(self.cols)}
+        self.draws = 0
+        self._checkpoint = self._rng_checkpoint()
+
+    def _rng_checkpoint(self) -> RngCheckpoint:
+        version, internal, gauss_next = self.rng.getstate()
+        return RngCheckpoint(self.draws, (version, struct.pack(f"<{len(internal)}I", *internal), gauss_next))
 
-    def draw(self, screen: pygame.Surface, images: dict) -> None:
+    def snapshot(self) -> BoardSnapshot:
+        """
+        回傳目前盤面的快照，需在盤面穩定（沒有待補充的空格）時呼叫。
+        距離上一個檢查點超過 CHECKPOINT_DRAWS 時先建立新的檢查點，讓還原的成本不隨對局長度增加。
+        """
+        if self.draws - self._checkpoint.draws >= CHECKPOINT_DRAWS:
+            self._checkpoint = self._rng_checkpoint()
+        return BoardSnapshot(TileManager.encode_tiles(self.tiles), self.draws, self._checkpoint)
+
+    def restore(self, snapshot: BoardSnapshot) -> None:
+        """
+        還原到快照時的盤面與亂數位置，之後的補充符石與當時相同。
+        """
+        self.tiles = TileManager.decode_tiles(snapshot.codes, self.rows, self.cols, self.compact)
+        checkpoint = snapshot.checkpoint
+        version, internal, gauss_next = checkpoint.state
+        self.rng.setstate((version, struct.unpack(f"<{len(internal) // 4}I", internal), gauss_next))
+        draw_stones(snapshot.draws - checkpoint.draws, self.rng)  # 由檢查點往前推進到快照時的位置
+        self.draws = snapshot.draws
+        self._checkpoint = checkpoint
+        self.drag_path = []
+        self.dirty = {(row, col) for row in range(self.rows) for col in range(self.cols)}
+
+    def draw(self, screen: "pygame.Surface", images: dict) -> None:
         """
         繪製遊戲盤面，包括符石與黑色格線。
         """
@@ -32,7 +183,10 @@ class Board:
         """
         處理拖曳過程。
         """
+        length = len(self.drag_path)
         TileManager.continue_drag(self.tiles, current_pos, self.drag_path, self.rows, self.cols, self.tile_size)
+        if len(self.drag_path) > length:
+            self.dirty.update(self.drag_path[length - 1:])
 
     def end_drag(self) -> None:
         """
@@ -40,37 +194,136 @@ class Board:
         """
         self.drag_path = []
 
-    def check_matches(self) -> set:
+    def apply_path(self, path: Iterable[Tuple[int, int]]) -> None:
+        """
+        以格子座標執行一次完整拖曳（不經過滑鼠像素座標），供無頭模擬使用。
+        """
+        path = list(path)
+        TileManager.apply_path(self.tiles, path)
+        self.dirty.update(path)
+
+    def check_matches(self, rows: Optional[Iterable[int]] = None, cols: Optional[Iterable[int]] = None) -> set:
         """
         檢查盤面上的三消匹配，並移除匹配的格子。
+        指定 rows / cols 時只檢查這些列與行。
         """
-        return TileManager.check_matches(self.tiles)
+        self.calls["check_matches"] += 1
+        matched = TileManager.check_matches(self.tiles, rows, cols)
+        self.dirty |= matched
+        return matched
 
-    def apply_gravity(self) -> None:
+    def check_groups(
+        self, rows: Optional[Iterable[int]] = None, cols: Optional[Iterable[int]] = None
+    ) -> List[MatchGroup]:
         """
-        讓符石下落並補充新的符石。
+        與 check_matches 相同，但回傳分好組的相連同類型群組。
         """
-        TileManager.apply_gravity(self.tiles, self.rows, self.cols)
+        self.calls["check_matches"] += 1
+        groups = TileManager.check_groups(self.tiles, rows, cols)
+        for group in groups:
+            self.dirty |= group.cells
+        return groups
+
+    def apply_gravity(self, columns: Optional[Iterable[int]] = None) -> GravityResult:
+        """
+        讓符石下落並補充新的符石，回傳每顆符石的移動與補充。
+        :param columns: 只處理這些行（例如有消除的行），預設處理全部
+        """
+        self.calls["apply_gravity"] += 1
+        result = TileManager.apply_gravity(self.tiles, self.rows, self.cols, self.rng, columns)
+        self.dirty |= result.changed
+        self.draws += len(result.spawns)  # 每個空格補充時抽出一顆符石
+        return result
+
+    def resolve_cascades(self) -> List[CascadeStep]:
+        """
+        反覆消除與下落直到盤面穩定，回傳每一步的消除紀錄。
+        第一步檢查整個盤面，之後只重新檢查下落與補充時變動的列與行。
+        """
+        steps: List[CascadeStep] = []
+        groups = self.check_groups()
+        while groups:
+            cleared = frozenset().union(*(group.cells for group in groups))
+            gravity = self.apply_gravity({col for _, col in cleared})
+            steps.append(CascadeStep(cleared, len(groups), tuple(groups), gravity))
+            changed = gravity.changed
+            groups = self.check_groups({row for row, _ in changed}, {col for _, col in changed})
+        return steps
 
 
 class TileManager:
     @staticmethod
-    def generate_board(rows: int, cols: int) -> List[List[Optional[Runestone]]]:
+    def make_rng(rng: Union[int, random.Random, None] = None) -> random.Random:
         """
-        生成一個隨機的遊戲盤面，保證沒有初始消除的情況。
+        將種子或亂數產生器統一轉為 random.Random。
         """
-        while True:
-            tiles: List[List[Optional[Runestone]]] = [
-                [Runestone(random.choice(list(StoneType))) for _ in range(cols)] for _ in range(rows)
-            ]
-            if not TileManager.has_initial_matches(tiles):
-                return tiles
+        return rng if isinstance(rng, random.Random) else random.Random(rng)
+
+    @staticmethod
+    def generate_board(
+        rows: int, cols: int, rng: Union[int, random.Random, None] = None
+    ) -> List[List[Optional[Runestone]]]:
+        """
+        一次建構出沒有初始消除的隨機盤面。
+        每格只從「不會與左邊兩格或上面兩格連成三顆」的類型中挑選，
+        符石類型至少有三種時候選永遠不為空，所以不需要重抽。
+        :param rng: 亂數種子或產生器，指定時盤面可重現
+        """
+        rng = TileManager.make_rng(rng)
+        tiles: List[List[Optional[Runestone]]] = []
+        for row in range(rows):
+            line: List[Optional[Runestone]] = []
+            above = tiles[row - 1] if row >= 2 else None
+            above2 = tiles[row - 2] if row >= 2 else None
+            for col in range(cols):
+                # 符石是共用實例，直接比較物件即可判斷類型是否相同
+                banned = []
+                if col >= 2 and line[col - 1] is line[col - 2]:
+                    banned.append(line[col - 1])
+                if above is not None and above[col] is above2[col]:
+                    banned.append(above[col])
+                line.append(rng.choice([s for s in STONES if s not in banned]) if banned else rng.choice(STONES))
+            tiles.append(line)
+        return tiles
+
+    @staticmethod
+    def encode_tiles(tiles: List[List[Optional[Runestone]]]) -> bytes:
+        """
+        將盤面編碼成每格一個位元組的類型代碼（空格為 EMPTY_BYTE）。
+        """
+        if isinstance(tiles, StoneGrid):
+            return tiles.to_bytes()
+        return bytes(EMPTY_BYTE if stone is None else TYPE_CODES[stone.type] for row in tiles for stone in row)
+
+    @staticmethod
+    def decode_tiles(data: bytes, rows: int, cols: int, compact: bool = False) -> List[List[Optional[Runestone]]]:
+        """
+        還原 encode_tiles 編碼的盤面。
+        :param compact: 是否還原成 StoneGrid
+        """
+        if compact:
+            return StoneGrid.from_bytes(data, rows, cols)
+        return [
+            [None if code == EMPTY_BYTE else STONES[code] for code in data[row * cols:(row + 1) * cols]]
+            for row in range(rows)
+        ]
+
+    @staticmethod
+    def clone_tiles(tiles: List[List[Optional[Runestone]]]) -> List[List[Optional[Runestone]]]:
+        """
+        複製盤面供搜尋試算；符石是共用的不可變實例，只需複製各列，不必深複製。
+        """
+        if isinstance(tiles, StoneGrid):
+            return tiles.copy()
+        return [row[:] for row in tiles]
 
     @staticmethod
     def has_initial_matches(tiles: List[List[Optional[Runestone]]]) -> bool:
         """
         檢查是否存在初始的三消匹配。
         """
+        if isinstance(tiles, StoneGrid):
+            return tiles.has_matches()
         for row in range(len(tiles)):
             for col in range(len(tiles[0]) - 2):
                 if tiles[row][col] and tiles[row][col + 1] and tiles[row][col + 2]:
@@ -86,7 +339,7 @@ class TileManager:
     @staticmethod
     def draw_tiles(
         tiles: List[List[Optional[Runestone]]],
-        screen: pygame.Surface,
+        screen: "pygame.Surface",
         images: dict,
         tile_size: int
     ) -> None:
@@ -95,11 +348,24 @@ class TileManager:
         """
         for row in range(len(tiles)):
             for col in range(len(tiles[0])):
-                tile = tiles[row][col]
-                x, y = col * tile_size + 50, row * tile_size + 300
-                if tile:
-                    screen.blit(images[tile.type.value], (x, y))
-                pygame.draw.rect(screen, (0, 0, 0), (x, y, tile_size, tile_size), 2)
+                x, y = col * tile_size + BOARD_X, row * tile_size + BOARD_Y
+                TileManager.draw_cell(tiles[row][col], screen, images, x, y, tile_size)
+
+    @staticmethod
+    def draw_cell(
+        tile: Optional[Runestone],
+        surface: "pygame.Surface",
+        images: dict,
+        x: int,
+        y: int,
+        tile_size: int
+    ) -> None:
+        """
+        繪製單一格子的符石與格線。
+        """
+        if tile:
+            surface.blit(images[tile.type.value], (x, y))
+        pygame.draw.rect(surface, (0, 0, 0), (x, y, tile_size, tile_size), 2)
 
     @staticmethod
     def handle_drag(
@@ -114,7 +380,7 @@ class TileManager:
         處理拖曳開始點。
         """
         start_x, start_y = start_pos
-        start_col, start_row = (start_x - 50) // tile_size, (start_y - 300) // tile_size
+        start_col, start_row = (start_x - BOARD_X) // tile_size, (start_y - BOARD_Y) // tile_size
 
         if 0 <= start_row < rows and 0 <= start_col < cols:
             drag_path.append((start_row, start_col))
@@ -130,27 +396,103 @@ class TileManager:
     ) -> None:
         """
         處理拖曳中的移動，交換兩個格子的內容。
+        游標一次跳過多格時，沿著經過的格子逐格交換，每次交換的兩格都上下或左右相鄰。
         """
         current_x, current_y = current_pos
-        current_col, current_row = (current_x - 50) // tile_size, (current_y - 300) // tile_size
+        current_col, current_row = (current_x - BOARD_X) // tile_size, (current_y - BOARD_Y) // tile_size
 
         if 0 <= current_row < rows and 0 <= current_col < cols:
             if drag_path and drag_path[-1] != (current_row, current_col):
-                last_row, last_col = drag_path[-1]
-                tiles[last_row][last_col], tiles[current_row][current_col] = (
-                    tiles[current_row][current_col],
-                    tiles[last_row][last_col],
-                )
-                drag_path.append((current_row, current_col))
+                cells = TileManager.walk_cells(drag_path[-1], (current_row, current_col))
+                TileManager.apply_path(tiles, [drag_path[-1]] + cells)
+                drag_path.extend(cells)
 
- 
     @staticmethod
-    def check_matches(tiles):
+    def walk_cells(start: Tuple[int, int], end: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        回傳從 start 走到 end 依序經過的格子（不含 start），每一步只移動一格上下或左右。
+        以整數運算沿兩格中心的連線前進，剛好經過格子角落時先走縱向。
+        """
+        (row, col), (end_row, end_col) = start, end
+        n_rows, n_cols = abs(end_row - row), abs(end_col - col)
+        step_row, step_col = (1 if end_row > row else -1), (1 if end_col > col else -1)
+        cells: List[Tuple[int, int]] = []
+        i_row = i_col = 0
+        while i_row < n_rows or i_col < n_cols:
+            # 比較 (0.5 + i_col) / n_cols 與 (0.5 + i_row) / n_rows，決定先跨過哪一條格線
+            if (1 + 2 * i_col) * n_rows < (1 + 2 * i_row) * n_cols:
+                col += step_col
+                i_col += 1
+            else:
+                row += step_row
+                i_row += 1
+            cells.append((row, col))
+        return cells
+
+    @staticmethod
+    def apply_path(tiles: List[List[Optional[Runestone]]], path: Iterable[Tuple[int, int]]) -> None:
+        """
+        沿著格子路徑依序交換相鄰兩點的符石，效果與 continue_drag 逐格拖曳相同。
+        """
+        if isinstance(tiles, StoneGrid):
+            tiles.swap_path(path)
+            return
+        last: Optional[Tuple[int, int]] = None
+        for cell in path:
+            if last is not None and cell != last:
+                (last_row, last_col), (row, col) = last, cell
+                tiles[last_row][last_col], tiles[row][col] = tiles[row][col], tiles[last_row][last_col]
+            last = cell
+
+    @staticmethod
+    def check_matches(
+        tiles: List[List[Optional[Runestone]]],
+        rows: Optional[Iterable[int]] = None,
+        cols: Optional[Iterable[int]] = None
+    ) -> Set[Tuple[int, int]]:
         """
         檢查盤面上的三消匹配，並移除匹配的格子。
+        指定 rows / cols 時只檢查這些列的橫向與這些行的縱向連線（用於連鎖時的局部重查）。
+        """
+        matched = TileManager.find_matches(tiles, rows, cols)
+        TileManager.clear_cells(tiles, matched)
+        return matched
+
+    @staticmethod
+    def check_groups(
+        tiles: List[List[Optional[Runestone]]],
+        rows: Optional[Iterable[int]] = None,
+        cols: Optional[Iterable[int]] = None
+    ) -> List[MatchGroup]:
+        """
+        檢查三消匹配並移除匹配的格子，回傳相連同類型的群組（每組算一個 combo）。
+        """
+        if isinstance(tiles, StoneGrid):
+            return [
+                TileManager.make_group(STONES[code].type, group_rows, group_cols)
+                for code, group_rows, group_cols in tiles.find_groups(rows, cols, clear=True)
+            ]
+        matched = TileManager.find_matches(tiles, rows, cols)
+        groups = TileManager.group_matches(tiles, matched)
+        TileManager.clear_cells(tiles, matched)
+        return groups
+
+    @staticmethod
+    def find_matches(
+        tiles: List[List[Optional[Runestone]]],
+        rows: Optional[Iterable[int]] = None,
+        cols: Optional[Iterable[int]] = None
+    ) -> Set[Tuple[int, int]]:
+        """
+        回傳三消匹配的格子座標，不修改盤面。
         """
+        if isinstance(tiles, StoneGrid):
+            return tiles.find_matches(rows, cols)
+
+        if rows is None and cols is None:
+            rows, cols = range(len(tiles)), range(len(tiles[0]))
         matched = set()
-        for row in range(len(tiles)):
+        for row in rows or ():
             for col in range(len(tiles[0]) - 2):
                 if (
                     tiles[row][col] and
@@ -159,7 +501,7 @@ class TileManager:
                     tiles[row][col].type == tiles[row][col + 1].type == tiles[row][col + 2].type
                 ):
                     matched.update({(row, col), (row, col + 1), (row, col + 2)})
-        for col in range(len(tiles[0])):
+        for col in cols or ():
             for row in range(len(tiles) - 2):
                 if (
                     tiles[row][col] and
@@ -168,24 +510,109 @@ class TileManager:
                     tiles[row][col].type == tiles[row + 1][col].type == tiles[row + 2][col].type
                 ):
                     matched.update({(row, col), (row + 1, col), (row + 2, col)})
+        return matched
 
-        for row, col in matched:
+    @staticmethod
+    def clear_cells(tiles: List[List[Optional[Runestone]]], cells: Set[Tuple[int, int]]) -> None:
+        """
+        將指定的格子清空。
+        """
+        if isinstance(tiles, StoneGrid):
+            tiles.clear(cells)
+            return
+        for row, col in cells:
             tiles[row][col] = None
 
-        return matched
+    @staticmethod
+    def group_matches(tiles: List[List[Optional[Runestone]]], matched: Set[Tuple[int, int]]) -> List[MatchGroup]:
+        """
+        將匹配的格子分成相連的同類型群組，需在清空格子之前呼叫。
+        """
+        cols = len(tiles[0])
+        types = {row * cols + col: tiles[row][col].type for row, col in matched}
+        return [
+            TileManager.make_group(
+                types[cells[0]], [cell // cols for cell in cells], [cell % cols for cell in cells]
+            )
+            for cells in TileManager.label_groups(types, cols)
+        ]
+
+    @staticmethod
+    def make_group(stone_type: StoneType, group_rows: List[int], group_cols: List[int]) -> MatchGroup:
+        """
+        由群組各格的列與行建立 MatchGroup。
+        """
+        return MatchGroup(
+            stone_type,
+            frozenset(zip(group_rows, group_cols)),
+            max(group_rows) - min(group_rows) + 1,
+            max(group_cols) - min(group_cols) + 1
+        )
+
+    @staticmethod
+    def label_groups(types: Dict[int, Hashable], cols: int) -> List[List[int]]:
+        """
+        以 union-find 將匹配的格子分成相連的同類型群組，時間與匹配格子數成線性。
+        :param types: 匹配格子的扁平索引（row * cols + col）與其類型
+        :return: 每個群組的格子索引
+        """
+        parent = {cell: cell for cell in types}
+
+        def find(cell: int) -> int:
+            while parent[cell] != cell:
+                parent[cell] = parent[parent[cell]]  # 路徑減半
+                cell = parent[cell]
+            return cell
+
+        for cell, kind in types.items():
+            # 只需與右方與下方的鄰格合併，左方與上方會由鄰格處理
+            if (cell + 1) % cols and types.get(cell + 1) == kind:
+                parent[find(cell)] = find(cell + 1)
+            if types.get(cell + cols) == kind:
+                parent[find(cell)] = find(cell + cols)
+
+        groups: Dict[int, List[int]] = {}
+        for cell in types:
+            groups.setdefault(find(cell), []).append(cell)
+        return list(groups.values())
 
 
     @staticmethod
-    def apply_gravity(tiles: List[List[Optional[Runestone]]], rows: int, cols: int) -> None:
+    def apply_gravity(
+        tiles: List[List[Optional[Runestone]]],
+        rows: int,
+        cols: int,
+        rng: Optional[random.Random] = None,
+        columns: Optional[Iterable[int]] = None
+    ) -> GravityResult:
         """
-        讓符石下落並生成新的符石填補空格。
+        讓符石下落並生成新的符石填補空格：每行由下往上壓實一次，時間與行高成線性。
+        :param columns: 只處理這些行（例如有消除的行），預設處理全部
+        :return: 每顆移動的符石（來源列、目的列）與補充的符石
         """
-        for col in range(cols):
+        if isinstance(tiles, StoneGrid):
+            moves, refill_rows, refill_cols = tiles.compact(columns)
+            stones = draw_stones(len(refill_rows), rng) if refill_rows else []
+            tiles.fill(refill_rows, refill_cols, stones)
+            return GravityResult(list(starmap(Fall, moves)), list(map(Spawn, refill_rows, refill_cols, stones)))
+        falls: List[Fall] = []
+        refill: List[Tuple[int, int]] = []
+        # 依行號遞增處理，補充符石的抽出順序與逐行掃描相同
+        for col in sorted(columns) if columns is not None else range(cols):
+            target = rows - 1  # 下一顆符石要落到的列
             for row in range(rows - 1, -1, -1):
-                if not tiles[row][col]:
-                    for upper_row in range(row - 1, -1, -1):
-                        if tiles[upper_row][col]:
-                            tiles[row][col], tiles[upper_row][col] = tiles[upper_row][col], None
-                            break
-                    if not tiles[row][col]:
-                        tiles[row][col] = Runestone(random.choice(list(StoneType)))
+                stone = tiles[row][col]
+                if stone is not None:
+                    if row != target:
+                        tiles[target][col] = stone
+                        falls.append(Fall(col, row, target))
+                    target -= 1
+            # 壓實後上方剩下的列全部補充（由下往上）
+            refill.extend((row, col) for row in range(target, -1, -1))
+        # 整次下落所需的補充符石一次抽出
+        spawns: List[Spawn] = []
+        if refill:
+            for (row, col), stone in zip(refill, draw_stones(len(refill), rng)):
+                tiles[row][col] = stone
+                spawns.append(Spawn(row, col, stone))
+        return GravityResult(falls, spawns)
@@ -0,0 +1,95 @@
+import struct
+from board import Board
+from typing import List, Optional, Tuple
+
+Cell = Tuple[int, int]
+
+# 方向代碼：每一步只會上下左右移動一格，用 2 個位元記錄
+DIRECTIONS: Tuple[Cell, ...] = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+_HEADER = struct.Struct("<HHH")  # 起點列、起點行、步數
+
+
+def encode_path(path: List[Cell]) -> bytes:
+    """
+    將拖曳路徑壓縮成位元組：6 位元組的起點與步數，之後每 4 步共用 1 個位元組。
+    :raises ValueError: 路徑中有不相鄰的兩格
+    """
+    if not path:
+        return b""
+    data = bytearray(_HEADER.pack(path[0][0], path[0][1], len(path) - 1))
+    packed = 0
+    for index, ((last_row, last_col), (row, col)) in enumerate(zip(path, path[1:])):
+        code = DIRECTION_CODES.get((row - last_row, col - last_col))
+        if code is None:
+            raise ValueError(f"cells {path[index]} and {path[index + 1]} are not adjacent")
+        packed |= code << (2 * (index % 4))
+        if index % 4 == 3:
+            data.append(packed)
+            packed = 0
+    if (len(path) - 1) % 4:
+        data.append(packed)
+    return bytes(data)
+
+
+def decode_path(data: bytes) -> List[Cell]:
+    """
+    還原 encode_path 壓縮的拖曳路徑。
+    """
+    if not data:
+        return []
+    row, col, steps = _HEADER.unpack_from(data)
+    path: List[Cell] = [(row, col)]
+    for index in range(steps):
+        d_row, d_col = DIRECTIONS[(data[_HEADER.size + index // 4] >> (2 * (index % 4))) & 3]
+        row, col = row + d_row, col + d_col
+        path.append((row, col))
+    return path
+
+
+class DragInput:
+    """
+    拖曳輸入層：把同一幀內的多個滑鼠移動事件合併成一次盤面更新，
+    並在放開時以壓縮格式記錄整條拖曳路徑。
+    """
+
+    def __init__(self, board: Board) -> None:
+        self.board: Board = board
+        self.active: bool = False
+        self.pending: Optional[Tuple[int, int]] = None  # 本幀最後一個尚未處理的滑鼠位置
+        self.last_swaps: bytes = b""  # 上一次拖曳的壓縮路徑
+
+    def press(self, pos: Tuple[int, int]) -> None:
+        """
+        開始拖曳；按在盤面外時不會啟動。
+        """
+        self.board.end_drag()
+        self.board.handle_drag(pos)
+        self.active = bool(self.board.drag_path)
+        self.pending = None
+
+    def move(self, pos: Tuple[int, int]) -> None:
+        """
+        記錄滑鼠位置，實際交換延到 flush() 才處理。
+        """
+        if self.active:
+            self.pending = pos
+
+    def flush(self) -> None:
+        """
+        以本幀最後的滑鼠位置更新盤面，每幀呼叫一次。
+        """
+        if self.pending is not None:
+            self.board.continue_drag(self.pending)
+            self.pending = None
+
+    def release(self) -> List[Cell]:
+        """
+        結束拖曳：處理尚未更新的移動，記錄並回傳整條路徑。
+        """
+        self.flush()
+        path = list(self.board.drag_path)
+        self.last_swaps = encode_path(path)
+        self.board.end_drag()
+        self.active = False
+        return path
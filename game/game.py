@@ -1,24 +1,52 @@
+import argparse
 import pygame
 import os
-from board import Board
-from utils import ImageManager, HealthBar, StatusBar
+import random
+from state import GameState
+from solver import solve
+from assets import AssetPack
+from audio import AudioManager
+from drag import DragInput
+from levels import DEFAULT_LEVELS, LevelTable, check_sprites, load_levels
+from profiler import FrameProfiler
+from replay import Recorder
+from renderer import BoardRenderer
+from utils import ImageManager, HealthBar, StatusBar, render_cache
 from typing import Optional, Dict, Tuple, List
 
 class GameManager:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        profile_path: Optional[str] = None,
+        record_path: Optional[str] = None,
+        seed: Optional[int] = None,
+        levels_path: Optional[str] = None
+    ) -> None:
         """
         初始化遊戲的相關參數與模組。
+        :param profile_path: 指定時量測每幀各階段耗時，並在結束時寫出紀錄（CSV 或 JSON）
+        :param record_path: 指定時將種子與每次拖曳寫成紀錄檔，可用 replay.py 重播
+        :param seed: 亂數種子，未指定時隨機選一個（錄製時需要知道實際的種子）
+        :param levels_path: 關卡設定檔，未指定時使用 levels.json
         """
         self.screen_width: int = 720
         self.screen_height: int = 800
         self.rows: int = 5
         self.cols: int = 6
         self.tile_size: int = 100
-        self.fps: int = 60
+        self.fps: int = 60  # 繪製的上限幀率
+
+        # 固定時間步長：遊戲邏輯以 logic_hz 推進，與實際繪製幀率無關
+        self.fixed_timestep: bool = True
+        self.logic_hz: int = 60
+        self.max_catch_up: int = 15  # 單次迴圈最多補跑的邏輯步數，避免卡頓後連鎖追趕
+        self.idle_fps: int = 15  # 畫面沒有變化時的輪詢幀率
+        self._accumulator: float = 0.0  # 尚未推進的經過時間（毫秒）
+        self._frame_key: Optional[tuple] = None  # 上一次繪製時的畫面內容摘要
 
         # 初始化 Pygame
         pygame.init()
-        pygame.mixer.init()
+        render_cache.clear()
 
         # 建立畫布
         self.screen: pygame.Surface = pygame.display.set_mode((self.screen_width, self.screen_height))
@@ -27,33 +55,52 @@ class GameManager:
 
         # 加載圖片與音效
         self.image_paths: Dict[str, str] = self._get_image_paths()
-        self.images: Dict[str, pygame.Surface] = ImageManager.load_images(
-            self.image_paths, self.tile_size, self.screen_width, self.screen_height
+        self.levels: LevelTable = load_levels(levels_path) if levels_path else DEFAULT_LEVELS
+        check_sprites(self.levels, self.image_paths)
+        sizes: Dict[str, Tuple[int, int]] = {
+            key: ImageManager.target_size(key, self.tile_size, self.screen_width, self.screen_height)
+            for key in self.image_paths
+        }
+        paths: Dict[str, str] = dict(self.image_paths)
+        for spec in self.levels:  # 每關的敵人直接烘焙成該關的顯示尺寸
+            paths[spec.sprite] = self.image_paths[spec.enemy]
+            sizes[spec.sprite] = spec.size
+        # 起始畫面先同步載入，其餘圖片在起始畫面顯示期間由背景執行緒載入
+        self.images: AssetPack = AssetPack(
+            paths, sizes, os.path.join(os.path.dirname(__file__), "Image", "assets.pack")
+        ).load(critical=["start_background"])
+        self.enemy_sprites: Tuple[pygame.Surface, ...] = ()  # 依關卡索引排列，起始畫面結束後建立
+        # 音效在起始畫面顯示期間由背景執行緒解碼，match 音效使用保留的聲道池
+        self.audio: AudioManager = AudioManager({"match": "music/caraccident.mp3"}).load()
+
+        # 遊戲規則核心（不依賴 pygame）
+        self.seed: int = seed if seed is not None else random.randrange(2 ** 32)
+        self.state: GameState = GameState(
+            self.rows, self.cols, self.tile_size, self.screen_width, self.seed, levels=self.levels
         )
-        self.match_sound: Optional[pygame.mixer.Sound] = self._load_sound("music/caraccident.mp3")
-        self._initialize_music("music/bgm.mp3")
-
-        # 遊戲核心模組
-        self.board: Board = Board(self.rows, self.cols, self.tile_size)
-        self.level: int = 1
-        self.traffic_tickets: int = 0
-        self.combo: int = 0
-
-        # 敵人參數
-        self.enemies: List[str] = ["man", "old_woman", "kid_and_dog"]
-        self.enemy_health: List[int] = [150, 250, 500]
-        self.enemy_sizes: List[Tuple[int, int]] = [(150, 200), (250, 220), (150, 200)]
-        self.current_enemy_index: int = 0
-        self.max_health: int = self.enemy_health[self.current_enemy_index]
-        self.health: int = self.max_health
-        self.enemy_x: int = -self.enemy_sizes[self.current_enemy_index][0]  # 起始位置
+        self.recorder: Optional[Recorder] = Recorder(record_path, self.seed, self.state) if record_path else None
         self.enemy_y: int = 31  # 與原始設定一致
-        self.enemy_speed: float = 1.0  # 第一關初始速度較快
 
         # 控制參數
         self.running: bool = True
         self.dragging: bool = False
+        self.drag_input: DragInput = DragInput(self.state.board)  # 合併同一幀的滑鼠移動事件
         self.start_pos: Optional[Tuple[int, int]] = None
+        self.hint: List[Tuple[int, int]] = []  # 按 H 顯示的建議拖曳路徑
+
+        # 局部更新（dirty rect）繪製：盤面快取在離屏 Surface，只送出有變動的區域
+        self.dirty_rendering: bool = True
+        self.board_renderer: BoardRenderer = BoardRenderer(self.state.board)
+        self.full_redraw: bool = True  # 下一幀是否需要重畫整個畫面
+        self._drawn_hint: List[Tuple[int, int]] = []
+        self._enemy_rect: pygame.Rect = pygame.Rect(0, 0, 0, 0)
+        self._status: Tuple[int, int, int] = (0, 0, 0)
+        self._status_rect: pygame.Rect = pygame.Rect(0, 0, 0, 0)
+
+        # 效能量測：F3 切換疊加層
+        self.profiler: FrameProfiler = FrameProfiler(trace_path=profile_path)
+        self.show_profile: bool = False
+        self.profile_rect: pygame.Rect = pygame.Rect(self.screen_width - 250, 0, 250, 220)
 
     def _get_image_paths(self) -> Dict[str, str]:
         """
@@ -75,134 +122,278 @@ class GameManager:
             "lose": os.path.join(base_dir, "Image", "lose.jpg")
         }
 
-    def _initialize_music(self, music_path: str) -> None:
+    def reset(self) -> None:
         """
-        初始化背景音樂。
+        重新開始遊戲：只重建遊戲狀態（盤面、敵人、計數與速度），
+        視窗、圖片、音效與 mixer 都沿用。
         """
-        if os.path.exists(music_path):
-            pygame.mixer.music.load(music_path)
-            pygame.mixer.music.set_volume(0.5)
-            pygame.mixer.music.play(-1)
-        else:
-            print(f"Error: Music file not found at {music_path}")
+        if self.recorder is not None:
+            self.recorder.reset()
+        self.state.reset()
+        self.dragging = False
+        self.drag_input.release()
+        self.start_pos = None
+        self.hint = []
+        self.full_redraw = True
+        self._accumulator = 0.0
+        self._frame_key = None
+
+    def show_start_screen(self) -> bool:
+        """
+        顯示起始畫面；按下 START 時回傳 True，關閉視窗時回傳 False。
+        """
+        return UIManager.show_start_screen(self.screen, self.images["start_background"])
+
+    def show_summary(self, failed: bool = False) -> None:
+        """
+        顯示結算畫面。
+        """
+        UIManager.show_summary(self.screen, self.state.traffic_tickets, self.images, failed)
+
+    def _draw_hint(self) -> None:
+        """
+        在盤面上畫出建議的拖曳路徑。
+        """
+        if len(self.hint) < 2:
+            return
+        points = [self.board_renderer.cell_center(cell) for cell in self.hint]
+        pygame.draw.lines(self.screen, (255, 255, 0), False, points, 6)
+        pygame.draw.circle(self.screen, (255, 255, 0), points[0], 12)
+
+    def _draw_hud(self, enemy_image: pygame.Surface) -> None:
+        """
+        繪製背景、敵人、血條與狀態欄；只會畫在畫布目前的 clip 區域內。
+        """
+        state: GameState = self.state
+        self.screen.fill((0, 0, 0))
+        self.screen.blit(self.images["background"], (0, 0))  # 背景圖
+        self.screen.blit(enemy_image, (state.enemy_x, self.enemy_y))
+        HealthBar.draw(
+            self.screen, state.health, state.max_health, state.enemy_x, self.enemy_y - 20,
+            state.spec.size[0], 10
+        )
+        StatusBar.draw(self.screen, state.traffic_tickets, state.combo, state.level)
+        if self.show_profile:
+            self._draw_profile()
+
+    def _draw_profile(self) -> None:
+        """
+        在右上角繪製各階段耗時的百分位數疊加層。
+        """
+        self.screen.fill((0, 0, 0), self.profile_rect)
+        font = render_cache.font(20)
+        for i, line in enumerate(self.profiler.summary_lines()):
+            self.screen.blit(font.render(line, True, (0, 255, 0)), (self.profile_rect.x + 6, 6 + i * 18))
+
+    def toggle_profile(self) -> None:
+        """
+        切換效能疊加層；顯示疊加層或指定紀錄檔時才會量測。
+        """
+        self.show_profile = not self.show_profile
+        self.profiler.enabled = self.show_profile or self.profiler.trace_path is not None
+        self.full_redraw = True
+
+    def _draw_full(self, enemy_image: pygame.Surface) -> None:
+        """
+        重畫整個畫面並送出整張畫布。
+        """
+        started = self.profiler.start()
+        self._draw_hud(enemy_image)
+        self.profiler.stop("hud", started)
+        started = self.profiler.start()
+        self.state.board.draw(self.screen, self.images)
+        self.state.board.dirty.clear()  # 整個盤面都已重畫，閒置時才能跳過繪製
+        self._draw_hint()
+        self.profiler.stop("board", started)
+        started = self.profiler.start()
+        pygame.display.flip()
+        self.profiler.stop("flip", started)
+        self.full_redraw = False
 
-    def _load_sound(self, sound_path: str) -> Optional[pygame.mixer.Sound]:
+    def _draw_dirty(self, enemy_image: pygame.Surface) -> None:
         """
-        加載音效檔案。
+        只重畫並送出有變動的區域：敵人與血條的新舊位置、數值改變的狀態欄，
+        以及盤面上被拖曳、消除或下落改變的格子。
         """
-        if os.path.exists(sound_path):
-            return pygame.mixer.Sound(sound_path)
+        state: GameState = self.state
+        width, height = state.spec.size
+        enemy_rect = pygame.Rect(int(state.enemy_x), self.enemy_y, width + 1, height).union(
+            HealthBar.bounds(state.health, state.max_health, int(state.enemy_x), self.enemy_y - 20, width + 1, 10)
+        )
+        status = (state.traffic_tickets, state.combo, state.level)
+        rects: List[pygame.Rect] = []
+        started = self.profiler.start()
+        if self.full_redraw:
+            self._draw_hud(enemy_image)
+            rects.append(self.screen.get_rect())
         else:
-            print(f"Error: Sound file not found at {sound_path}")
-            exit()
+            hud = [enemy_rect.union(self._enemy_rect)]
+            if status != self._status:
+                hud.append(self._status_rect.union(StatusBar.bounds(*status)))
+            if self.show_profile:
+                hud.append(self.profile_rect)
+            for rect in hud:
+                self.screen.set_clip(rect)
+                self._draw_hud(enemy_image)
+            self.screen.set_clip(None)
+            rects.extend(hud)
+        self._enemy_rect = enemy_rect
+        if status != self._status or self.full_redraw:
+            self._status, self._status_rect = status, StatusBar.bounds(*status)
+        self.profiler.stop("hud", started)
 
-    def show_start_screen(self) -> None:
+        # 提示路徑畫在盤面上方，盤面有變動時連同提示整個重畫
+        started = self.profiler.start()
+        redraw_board: bool = self.full_redraw or self.hint != self._drawn_hint or bool(self.hint and state.board.dirty)
+        board_rects = self.board_renderer.draw(self.screen, self.images, full=redraw_board)
+        if redraw_board:
+            self._draw_hint()
+            self._drawn_hint = list(self.hint)
+        rects.extend(board_rects)
+        self.profiler.stop("board", started)
+
+        started = self.profiler.start()
+        pygame.display.update(rects)
+        self.profiler.stop("flip", started)
+        self.full_redraw = False
+
+    def _logic_steps(self, elapsed: float) -> int:
         """
-        顯示起始畫面。
+        將經過的毫秒數累加起來，回傳本次迴圈應推進的邏輯步數。
         """
-        start_background: pygame.Surface = pygame.image.load(self.image_paths["start_background"])
-        start_background = pygame.transform.scale(start_background, (self.screen_width, self.screen_height))
-        UIManager.show_start_screen(self.screen, start_background)
+        if not self.fixed_timestep:
+            return 1
+        step_ms = 1000.0 / self.logic_hz
+        self._accumulator = min(self._accumulator + elapsed, step_ms * self.max_catch_up)
+        steps = int(self._accumulator // step_ms)
+        self._accumulator -= steps * step_ms
+        return steps
 
-    def show_summary(self, failed: bool = False) -> None:
+    def _needs_render(self) -> bool:
         """
-        顯示結算畫面。
+        判斷畫面內容是否與上一次繪製不同；固定時間步長模式下沒有變化時跳過繪製。
         """
-        UIManager.show_summary(self.screen, self.traffic_tickets, self.images, failed)
+        state: GameState = self.state
+        key = (
+            int(state.enemy_x), state.current_enemy_index, state.health, state.traffic_tickets,
+            state.combo, state.level, tuple(self.hint)
+        )
+        changed = key != self._frame_key or bool(state.board.dirty) or self.full_redraw or self.show_profile
+        self._frame_key = key
+        return changed or not self.fixed_timestep
 
     def main_loop(self) -> None:
         """
         遊戲主循環。
         """
-        self.show_start_screen()
+        self.audio.play_music("music/bgm.mp3")
+        self.running = self.show_start_screen()
+        if self.running:
+            self.enemy_sprites = tuple(self.images[spec.sprite] for spec in self.levels)
 
+        profiler: FrameProfiler = self.profiler
+        self.clock.tick()  # 丟棄起始畫面停留的時間
+        elapsed: float = 0.0
         while self.running:
-            self.screen.fill((0, 0, 0))
-            self.screen.blit(self.images["background"], (0, 0))  # 背景圖
-
+            events_started = profiler.start()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
 
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    self.start_pos = pygame.mouse.get_pos()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+                    self.hint = solve(self.state.board.tiles).path
+
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.toggle_profile()
+
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_z and not self.dragging:
+                    if self.state.undo():  # 復原上一次拖曳
+                        self.hint = []
+                        if self.recorder is not None:
+                            self.recorder.undo()
+
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_y and not self.dragging:
+                    if self.state.redo():  # 重做被復原的拖曳
+                        self.hint = []
+                        if self.recorder is not None:
+                            self.recorder.redo()
+
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    started = profiler.start()
+                    self.hint = []
+                    self.start_pos = event.pos
                     self.dragging = True
-                    self.board.handle_drag(self.start_pos)
+                    self.drag_input.press(event.pos)
+                    profiler.stop("drag", started)
 
                 if event.type == pygame.MOUSEMOTION and self.dragging:
-                    self.board.continue_drag(pygame.mouse.get_pos())
+                    self.drag_input.move(event.pos)  # 只記錄位置，本幀結束前統一處理
 
-                if event.type == pygame.MOUSEBUTTONUP:
+                if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                     self.dragging = False
-                    self.board.end_drag()
-                    matches = self.board.check_matches()
-                    if matches:
-                        self.match_sound.play()
-                        self.combo += 1
-                        damage: int = len(matches) * 10
-                        self.health -= damage
-                        self.traffic_tickets += damage
-                        if self.health <= 0:
-                            self.level += 1
-                            if self.level > len(self.enemies):
-                                self.show_summary()
-                                self.running = False
-                            else:
-                                self.current_enemy_index = self.level - 1
-                                self.health = self.enemy_health[self.current_enemy_index]
-                                self.max_health = self.health
-                                if self.level == 2:
-                                    self.enemy_speed -= 0.3  # 第二關速度
-                                elif self.level == 3:
-                                    self.enemy_speed += 0.1  # 第三關速度
-                                else:
-                                    self.enemy_speed += 0.5  # 提升速度
-                                self.enemy_x = -self.enemy_sizes[self.current_enemy_index][0]  # 重置敵人位置
-                        self.board.apply_gravity()
-
-            # 更新敵人位置
-            self.enemy_x += self.enemy_speed
-            if self.enemy_x > self.screen_width:  # 敵人走出畫布右邊
-                gameover_background: pygame.Surface = pygame.image.load(self.image_paths["lose"])
-                gameover_background = pygame.transform.scale(gameover_background, (self.screen_width, self.screen_height))
-                self.screen.blit(gameover_background, (0, 0))
+                    started = profiler.start()
+                    was_active: bool = self.drag_input.active
+                    path = self.drag_input.release()
+                    profiler.stop("drag", started)
+                    if not was_active or len(path) < 2:  # 盤面外、起始畫面遺留的放開或沒有交換：不算一次拖曳
+                        continue
+                    started = profiler.start()
+                    frame = self.state.frame
+                    result = self.state.resolve_move()
+                    profiler.stop("match", started)
+                    if self.recorder is not None:
+                        self.recorder.move(path, frame)
+                    if result.cascade:
+                        self.audio.play("match")
+                    if self.state.won:
+                        self.show_summary()
+                        self.running = False
+            started = profiler.start()
+            self.drag_input.flush()
+            profiler.stop("drag", started)
+            profiler.stop("events", events_started)
+
+            # 更新敵人位置（固定時間步長模式下依經過時間推進）
+            started = profiler.start()
+            for _ in range(self._logic_steps(elapsed)):
+                self.state.step()
+            profiler.stop("enemy", started)
+            if self.state.lost:  # 敵人走出畫布右邊
+                self.screen.blit(self.images["lose"], (0, 0))
                 pygame.display.flip()
                 waiting: bool = True
                 while waiting:
-                    for event in pygame.event.get():
-                        if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
-                            self.__init__()  # 重置遊戲
-                            self.main_loop()
-                            return
-                        elif event.type == pygame.QUIT:
-                            waiting = False
-                            self.running = False
-
-            # 繪製敵人
-            enemy_image: pygame.Surface = pygame.transform.scale(
-                self.images[self.enemies[self.current_enemy_index]],
-                self.enemy_sizes[self.current_enemy_index]
-            )
-            self.screen.blit(enemy_image, (self.enemy_x, self.enemy_y))
-            HealthBar.draw(
-                self.screen, self.health, self.max_health, self.enemy_x, self.enemy_y - 20,
-                self.enemy_sizes[self.current_enemy_index][0], 10
-            )
-
-            # 繪製遊戲盤面與狀態欄
-            self.board.draw(self.screen, self.images)
-            StatusBar.draw(self.screen, self.traffic_tickets, self.combo, self.level)
-
-            # 更新畫面
-            pygame.display.flip()
-            self.clock.tick(self.fps)
+                    event = pygame.event.wait()  # 畫面靜止，阻塞等待事件而不輪詢
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                        self.reset()  # 重置遊戲
+                        # 在起始畫面關閉視窗時同樣離開主循環，讓紀錄檔正常收尾
+                        self.running = self.show_start_screen()
+                        self.clock.tick()
+                        waiting = False
+                    elif event.type == pygame.QUIT:
+                        waiting = False
+                        self.running = False
+
+            # 繪製畫面（內容沒有變化時跳過，並降低輪詢幀率）
+            rendered: bool = self._needs_render()
+            if rendered:
+                enemy_image: pygame.Surface = self.enemy_sprites[self.state.current_enemy_index]
+                if self.dirty_rendering:
+                    self._draw_dirty(enemy_image)
+                else:
+                    self._draw_full(enemy_image)
+            profiler.end_frame(self.state.board.calls)
+            elapsed = self.clock.tick(self.fps if rendered or self.dragging else self.idle_fps)
 
+        profiler.close()
+        if self.recorder is not None:
+            self.recorder.close(self.state.board.drag_path)
         pygame.quit()
 
 
 class UIManager:
     @staticmethod
-    def show_start_screen(screen: pygame.Surface, background_image: pygame.Surface) -> None:
+    def show_start_screen(screen: pygame.Surface, background_image: pygame.Surface) -> bool:
         font_button: pygame.font.Font = pygame.font.Font(None, 48)
         button_text: pygame.Surface = font_button.render("START", True, (0, 0, 0))
         button_rect: pygame.Rect = pygame.Rect(260, 400, 200, 80)
@@ -215,14 +406,12 @@ class UIManager:
         )
         pygame.display.flip()
 
-        waiting: bool = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-                if event.type == pygame.MOUSEBUTTONDOWN and button_rect.collidepoint(event.pos):
-                    waiting = False
+        while True:
+            event = pygame.event.wait()  # 畫面靜止，阻塞等待事件而不輪詢
+            if event.type == pygame.QUIT:
+                return False
+            if event.type == pygame.MOUSEBUTTONDOWN and button_rect.collidepoint(event.pos):
+                return True
 
     @staticmethod
     def show_summary(screen: pygame.Surface, traffic_tickets: int, images: Dict[str, pygame.Surface], failed: bool = False) -> None:
@@ -242,5 +431,11 @@ class UIManager:
 
 
 if __name__ == "__main__":
-    game: GameManager = GameManager()
+    parser = argparse.ArgumentParser(description="行人地獄")
+    parser.add_argument("--profile", metavar="PATH", help="stream per-frame phase timings to PATH (.csv or .json)")
+    parser.add_argument("--record", metavar="PATH", help="record the seed and every drag to PATH for replay.py")
+    parser.add_argument("--seed", type=int, help="random seed for board generation and refills")
+    parser.add_argument("--levels", metavar="PATH", help="level config to play instead of levels.json")
+    args = parser.parse_args()
+    game: GameManager = GameManager(args.profile, args.record, args.seed, args.levels)
     game.main_loop()
\ No newline at end of file
@@ -0,0 +1,248 @@
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+from models import STONES, Runestone
+from stone_types import TYPE_CODES
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 為選用依賴，未安裝時盤面退回 List 實作
+    np = None
+
+HAS_NUMPY: bool = np is not None
+EMPTY: int = -1  # 空格的哨兵代碼
+_STONE_CODES = {stone: code for code, stone in enumerate(STONES)}  # 共用符石實例到類型代碼（以物件識別雜湊）
+
+
+class _GridRow:
+    """
+    StoneGrid 單列的檢視，讓 tiles[row][col] 的讀寫語意與 List 盤面一致。
+    """
+    __slots__ = ("_codes",)
+
+    def __init__(self, codes) -> None:
+        self._codes = codes
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, col: int) -> Optional[Runestone]:
+        code = int(self._codes[col])
+        return None if code == EMPTY else STONES[code]
+
+    def __setitem__(self, col: int, stone: Optional[Runestone]) -> None:
+        self._codes[col] = EMPTY if stone is None else TYPE_CODES[stone.type]
+
+    def __iter__(self) -> Iterator[Optional[Runestone]]:
+        return (self[col] for col in range(len(self._codes)))
+
+
+class StoneGrid:
+    """
+    以 int8 陣列儲存符石類型的精簡盤面，並以位移陣列比較偵測三消。
+    支援 tiles[row][col] 的索引方式，可直接替代 List[List[Optional[Runestone]]]。
+    """
+
+    def __init__(self, rows: int, cols: int) -> None:
+        """
+        建立全空的盤面。
+        :param rows: 列數
+        :param cols: 行數
+        """
+        if np is None:
+            raise ImportError("StoneGrid requires numpy")
+        self.codes = np.full((rows, cols), EMPTY, dtype=np.int8)
+
+    @classmethod
+    def from_tiles(cls, tiles: List[List[Optional[Runestone]]]) -> "StoneGrid":
+        """
+        由 List 盤面建立精簡盤面。
+        """
+        grid = cls(len(tiles), len(tiles[0]))
+        grid.codes[:] = [
+            [EMPTY if tile is None else TYPE_CODES[tile.type] for tile in row] for row in tiles
+        ]
+        return grid
+
+    def to_tiles(self) -> List[List[Optional[Runestone]]]:
+        """
+        轉回 List 盤面。
+        """
+        return [list(row) for row in self]
+
+    @classmethod
+    def from_bytes(cls, data: bytes, rows: int, cols: int) -> "StoneGrid":
+        """
+        由 to_bytes() 的結果還原盤面。
+        """
+        grid = cls.__new__(cls)
+        grid.codes = np.frombuffer(data, dtype=np.int8).reshape(rows, cols).copy()
+        return grid
+
+    def to_bytes(self) -> bytes:
+        """
+        每格一個位元組的類型代碼（空格為 0xFF）。
+        """
+        return self.codes.tobytes()
+
+    def copy(self) -> "StoneGrid":
+        grid = StoneGrid.__new__(StoneGrid)
+        grid.codes = self.codes.copy()
+        return grid
+
+    def __len__(self) -> int:
+        return self.codes.shape[0]
+
+    def __getitem__(self, row: int) -> _GridRow:
+        return _GridRow(self.codes[row])
+
+    def __iter__(self) -> Iterator[_GridRow]:
+        return (self[row] for row in range(len(self)))
+
+    @staticmethod
+    def _run_mask(codes):
+        """
+        標記每一列中連續三個以上同類型（非空）的格子。
+        """
+        mask = np.zeros(codes.shape, dtype=bool)
+        if codes.shape[1] < 3:
+            return mask
+        left, middle, right = codes[:, :-2], codes[:, 1:-1], codes[:, 2:]
+        runs = (left == middle) & (middle == right) & (left != EMPTY)
+        mask[:, :-2] |= runs
+        mask[:, 1:-1] |= runs
+        mask[:, 2:] |= runs
+        return mask
+
+    def match_mask(self, rows: Optional[Iterable[int]] = None, cols: Optional[Iterable[int]] = None):
+        """
+        回傳匹配格子的布林遮罩。
+        指定 rows / cols 時只檢查這些列的橫向與這些行的縱向連線。
+        """
+        if rows is None and cols is None:
+            return self._run_mask(self.codes) | self._run_mask(self.codes.T).T
+        mask = np.zeros(self.codes.shape, dtype=bool)
+        if rows:
+            rows = sorted(set(rows))
+            mask[rows, :] |= self._run_mask(self.codes[rows, :])
+        if cols:
+            cols = sorted(set(cols))
+            mask[:, cols] |= self._run_mask(self.codes[:, cols].T).T
+        return mask
+
+    def find_matches(
+        self, rows: Optional[Iterable[int]] = None, cols: Optional[Iterable[int]] = None
+    ) -> Set[Tuple[int, int]]:
+        """
+        回傳所有匹配格子的座標集合，不修改盤面。
+        """
+        matched_rows, matched_cols = np.nonzero(self.match_mask(rows, cols))
+        return set(zip(matched_rows.tolist(), matched_cols.tolist()))
+
+    def has_matches(self) -> bool:
+        """
+        檢查盤面上是否存在任何三消。
+        """
+        return bool(self.match_mask().any())
+
+    def clear(self, cells: Iterable[Tuple[int, int]]) -> None:
+        """
+        將指定格子設為空格。
+        """
+        cells = list(cells)
+        if cells:
+            rows, cols = zip(*cells)
+            self.codes[list(rows), list(cols)] = EMPTY
+
+    def find_groups(
+        self, rows: Optional[Iterable[int]] = None, cols: Optional[Iterable[int]] = None, clear: bool = False
+    ) -> List[Tuple[int, List[int], List[int]]]:
+        """
+        找出匹配格子並分成相連的同類型群組：以陣列運算反覆取相鄰同類型格子的最小標籤，
+        並以指標跳躍加速收斂，整個過程不逐格建立符石物件。
+        :param clear: 是否同時清空匹配的格子
+        :return: 每個群組的 (類型代碼, 各格的列, 各格的行)，依群組中最前面的格子排序
+        """
+        mask = self.match_mask(rows, cols)
+        cells = np.flatnonzero(mask)
+        if not cells.size:
+            return []
+        n_cols = self.codes.shape[1]
+        codes = self.codes.ravel()
+        flat_mask = mask.ravel()
+        # 右方與下方同類型的匹配鄰格構成的邊（以匹配格子的序號表示）
+        right = cells[(cells % n_cols != n_cols - 1)]
+        right = right[flat_mask[right + 1] & (codes[right] == codes[right + 1])]
+        down = cells[cells + n_cols < codes.size]
+        down = down[flat_mask[down + n_cols] & (codes[down] == codes[down + n_cols])]
+        first = np.searchsorted(cells, np.concatenate((right, down)))
+        second = np.searchsorted(cells, np.concatenate((right + 1, down + n_cols)))
+        labels = np.arange(cells.size)
+        while True:
+            merged = labels.copy()
+            np.minimum.at(merged, first, labels[second])
+            np.minimum.at(merged, second, labels[first])
+            merged = merged[merged]  # 標籤指向同群組中序號更小的格子，跳到該格子的標籤
+            if np.array_equal(merged, labels):
+                break
+            labels = merged
+        order = np.argsort(labels, kind="stable")
+        cells = cells[order]
+        starts = [0, *(np.flatnonzero(np.diff(labels[order])) + 1).tolist()]
+        ends = starts[1:] + [cells.size]
+        group_rows, group_cols = (values.tolist() for values in np.divmod(cells, n_cols))
+        groups = [
+            (code, group_rows[start:end], group_cols[start:end])
+            for code, start, end in zip(codes[cells[starts]].tolist(), starts, ends)
+        ]
+        if clear:
+            self.codes[mask] = EMPTY
+        return groups
+
+    def compact(
+        self, columns: Optional[Iterable[int]] = None
+    ) -> Tuple[List[Tuple[int, int, int]], List[int], List[int]]:
+        """
+        讓符石往下壓實，空格留在上方；所有行以一次陣列運算處理。
+        每顆符石的目的列由它下方的符石數決定。
+        :param columns: 只處理這些行，預設處理全部
+        :return: 移動的符石 (行, 來源列, 目的列)，以及壓實後上方空格的列與行；
+                 兩者都依行遞增、同一行由下往上，與 List 盤面逐行處理的順序相同
+        """
+        n_rows, n_cols = self.codes.shape
+        cols = np.arange(n_cols) if columns is None else np.array(sorted(set(columns)), dtype=np.intp)
+        if not cols.size:
+            return [], [], []
+        block = self.codes[:, cols]
+        filled = block != EMPTY
+        below = np.cumsum(filled[::-1], axis=0)[::-1] - filled
+        target = n_rows - 1 - below
+        source_rows, indices = np.nonzero(filled)
+        compacted = np.full_like(block, EMPTY)
+        compacted[target[source_rows, indices], indices] = block[source_rows, indices]
+        self.codes[:, cols] = compacted
+        moved = filled & (target != np.arange(n_rows)[:, None])
+        indices, flipped = np.nonzero(moved.T[:, ::-1])
+        source_rows = n_rows - 1 - flipped
+        falls = list(zip(cols[indices].tolist(), source_rows.tolist(), target[source_rows, indices].tolist()))
+        indices, flipped = np.nonzero(compacted.T[:, ::-1] == EMPTY)
+        return falls, (n_rows - 1 - flipped).tolist(), cols[indices].tolist()
+
+    def fill(self, rows: List[int], cols: List[int], stones: List[Runestone]) -> None:
+        """
+        依序將符石放入指定格子（rows[i], cols[i]）。
+        """
+        if stones:
+            self.codes[rows, cols] = [
+                _STONE_CODES[stone] if stone in _STONE_CODES else TYPE_CODES[stone.type] for stone in stones
+            ]
+
+    def swap_path(self, path: Iterable[Tuple[int, int]]) -> None:
+        """
+        沿著格子路徑依序交換相鄰兩點的類型代碼，不經過 _GridRow。
+        """
+        codes = self.codes
+        last: Optional[Tuple[int, int]] = None
+        for cell in path:
+            if last is not None and cell != last:
+                codes[last], codes[cell] = codes[cell], codes[last]
+            last = cell
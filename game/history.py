@@ -0,0 +1,59 @@
+from collections import deque
+from typing import Deque, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SnapshotRing(Generic[T]):
+    """
+    固定容量的快照環狀緩衝區，支援 undo / redo。
+    超過容量時自動捨棄最舊的快照，記憶體用量與容量成正比。
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        """
+        :param capacity: 最多保留的 undo 步數（redo 亦同）
+        """
+        self.capacity: int = capacity
+        self._undo: Deque[T] = deque(maxlen=capacity)
+        self._redo: Deque[T] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def push(self, snapshot: T) -> None:
+        """
+        記錄新的一步之前的快照，並捨棄 redo 紀錄。
+        """
+        self._undo.append(snapshot)
+        self._redo.clear()
+
+    def undo(self, current: T) -> Optional[T]:
+        """
+        回傳上一步的快照，並把目前的快照留給 redo；沒有紀錄時回傳 None。
+        """
+        if not self._undo:
+            return None
+        self._redo.append(current)
+        return self._undo.pop()
+
+    def redo(self, current: T) -> Optional[T]:
+        """
+        回傳 undo 前的快照，並把目前的快照留給 undo；沒有紀錄時回傳 None。
+        """
+        if not self._redo:
+            return None
+        self._undo.append(current)
+        return self._redo.pop()
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
@@ -0,0 +1,122 @@
+import json
+import math
+import os
+from typing import Dict, NamedTuple, Optional, Tuple
+
+LEVELS_PATH: str = os.path.join(os.path.dirname(__file__), "levels.json")
+_FIELDS = {"enemy", "health", "size", "speed", "speed_delta"}
+
+
+class LevelConfigError(ValueError):
+    """
+    關卡設定檔格式錯誤。
+    """
+
+
+class LevelSpec(NamedTuple):
+    """
+    編譯後單一關卡的敵人參數。
+    """
+    level: int  # 關卡編號（從 1 開始）
+    enemy: str  # 敵人圖片名稱
+    health: int
+    size: Tuple[int, int]  # 敵人圖片的顯示尺寸
+    speed: float  # 每影格前進的像素數
+
+    @property
+    def sprite(self) -> str:
+        """
+        已縮放成 size 的敵人圖片在圖片包中的名稱。
+        """
+        return f"level{self.level}_{self.enemy}"
+
+
+LevelTable = Tuple[LevelSpec, ...]
+
+
+def _positive_int(value: object, where: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        raise LevelConfigError(f"{where} must be a positive integer, got {value!r}")
+    return value
+
+
+def _number(value: object, where: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise LevelConfigError(f"{where} must be a finite number, got {value!r}")
+    return value
+
+
+def compile_levels(config: object, source: str = "<config>") -> LevelTable:
+    """
+    檢查關卡設定並編譯成不可變的關卡表。
+    每關指定 speed（絕對速度）或 speed_delta（相對前一關的增減）其中之一，第一關必須是 speed。
+    :param source: 錯誤訊息中顯示的來源名稱
+    :raises LevelConfigError: 設定不合法
+    """
+    levels = config.get("levels") if isinstance(config, dict) else None
+    if not isinstance(levels, list) or not levels:
+        raise LevelConfigError(f"{source}: 'levels' must be a non-empty list")
+    table = []
+    speed: Optional[float] = None
+    for index, entry in enumerate(levels):
+        where = f"{source}: levels[{index}]"
+        if not isinstance(entry, dict):
+            raise LevelConfigError(f"{where} must be an object")
+        unknown = set(entry) - _FIELDS
+        if unknown:
+            raise LevelConfigError(f"{where} has unknown keys {sorted(unknown)}")
+        enemy = entry.get("enemy")
+        if not isinstance(enemy, str) or not enemy:
+            raise LevelConfigError(f"{where}.enemy must be a non-empty string")
+        health = _positive_int(entry.get("health"), f"{where}.health")
+        size = entry.get("size")
+        if not isinstance(size, list) or len(size) != 2:
+            raise LevelConfigError(f"{where}.size must be [width, height]")
+        width, height = (_positive_int(value, f"{where}.size") for value in size)
+        if ("speed" in entry) == ("speed_delta" in entry):
+            raise LevelConfigError(f"{where} needs exactly one of 'speed' or 'speed_delta'")
+        if "speed" in entry:
+            speed = _number(entry["speed"], f"{where}.speed")
+        elif speed is None:
+            raise LevelConfigError(f"{where}: the first level needs an absolute 'speed'")
+        else:
+            speed += _number(entry["speed_delta"], f"{where}.speed_delta")
+        if not 0 < speed < math.inf:  # 累加的 speed_delta 也可能溢位成無限大
+            raise LevelConfigError(f"{where}: enemy speed must stay positive and finite, got {speed}")
+        table.append(LevelSpec(index + 1, enemy, health, (width, height), speed))
+    return tuple(table)
+
+
+def load_levels(path: str = LEVELS_PATH) -> LevelTable:
+    """
+    讀取並編譯關卡設定檔。
+    :raises LevelConfigError: 檔案無法讀取或設定不合法
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            config = json.load(file)
+    except (OSError, ValueError) as error:
+        raise LevelConfigError(f"{path}: {error}") from error
+    return compile_levels(config, path)
+
+
+def scale_levels(levels: LevelTable, health: float = 1.0, speed: float = 1.0) -> LevelTable:
+    """
+    回傳血量與速度乘上倍率的關卡變體（供模擬器掃描平衡參數）。
+    """
+    return tuple(
+        spec._replace(health=max(1, round(spec.health * health)), speed=spec.speed * speed) for spec in levels
+    )
+
+
+def check_sprites(levels: LevelTable, images: Dict[str, str]) -> None:
+    """
+    確認每關的敵人都有對應的圖片。
+    :raises LevelConfigError: 找不到敵人圖片
+    """
+    missing = sorted({spec.enemy for spec in levels} - set(images))
+    if missing:
+        raise LevelConfigError(f"no image for enemies {missing}")
+
+
+DEFAULT_LEVELS: LevelTable = load_levels()
@@ -1,18 +1,43 @@
-from stone_types import StoneType
+import random
+from stone_types import STONE_TYPES, StoneType
+from typing import Dict, List, Optional, Tuple
 
 
 class Runestone:
     """
     定義遊戲中的符石物件，每個符石有其類型和狀態。
+    符石是不可變的享元：相同 (類型, 狀態) 只會建立一個實例，盤面上的格子共用同一個物件。
     """
-    def __init__(self, _type: StoneType, _status: str = "") -> None:
+    __slots__ = ("type", "status")
+    _interned: Dict[Tuple[StoneType, str], "Runestone"] = {}
+
+    def __new__(cls, _type: StoneType, _status: str = "") -> "Runestone":
         """
-        初始化符石的屬性。
+        取得（必要時建立）符石實例。
         :param _type: 符石的類型（使用 StoneType 枚舉）
         :param _status: 符石的狀態（預設為空字串）
         """
-        self.type: StoneType = _type  # 符石的類型
-        self.status: str = _status  # 符石的狀態，例如是否被選中或拖曳
+        key = (_type, _status)
+        stone = cls._interned.get(key)
+        if stone is None:
+            stone = object.__new__(cls)
+            object.__setattr__(stone, "type", _type)  # 符石的類型
+            object.__setattr__(stone, "status", _status)  # 符石的狀態，例如是否被選中或拖曳
+            cls._interned[key] = stone
+        return stone
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("Runestone is immutable; use with_status() to get a stone with another status")
+
+    def __reduce__(self):
+        # 複製或跨行程傳遞時仍取回同一個共用實例
+        return Runestone, (self.type, self.status)
+
+    def with_status(self, status: str) -> "Runestone":
+        """
+        回傳相同類型、不同狀態的符石。
+        """
+        return Runestone(self.type, status)
 
     def __repr__(self) -> str:
         """
@@ -20,3 +45,14 @@ class Runestone:
         :return: 格式化後的符石資訊
         """
         return f"{self.type.value}({self.status})"
+
+
+# 每種類型的無狀態符石，依 STONE_TYPES 的順序排列
+STONES: Tuple[Runestone, ...] = tuple(Runestone(stone_type) for stone_type in STONE_TYPES)
+
+
+def draw_stones(count: int, rng: Optional[random.Random] = None) -> List[Runestone]:
+    """
+    一次抽出 count 顆隨機符石（例如整次下落所需的補充符石）。
+    """
+    return (rng or random).choices(STONES, k=count)
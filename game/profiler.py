@@ -0,0 +1,122 @@
+import csv
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, TextIO, Tuple
+
+# 每一幀量測的階段，依主循環中的執行順序排列
+PHASES: Tuple[str, ...] = ("events", "drag", "match", "enemy", "board", "hud", "flip")
+# 每一幀統計的盤面呼叫次數（對應 Board.calls 的鍵）
+COUNTERS: Tuple[str, ...] = ("check_matches", "apply_gravity")
+
+
+class FrameProfiler:
+    """
+    量測主循環每一幀各階段的耗時與盤面運算的呼叫次數。
+    停用時 start() 只回傳 0.0、stop() 直接返回，幾乎沒有成本。
+    指定紀錄檔時每一幀結束就寫出一列，記憶體用量不隨遊玩時間增加；結束時需呼叫 close()。
+    """
+
+    def __init__(self, enabled: bool = False, history: int = 600, trace_path: Optional[str] = None) -> None:
+        """
+        :param enabled: 是否開始量測
+        :param history: 疊加層計算百分位數時保留的最近幀數
+        :param trace_path: 逐幀紀錄的路徑（.json 為 JSON，其餘為 CSV）
+        """
+        self.enabled: bool = enabled or trace_path is not None
+        self.trace_path: Optional[str] = trace_path
+        self.history: Deque[Dict[str, float]] = deque(maxlen=history)
+        self.current: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self._counts: Dict[str, int] = {}
+        self._frames: int = 0  # 已寫入紀錄檔的幀數
+        self._trace_file: Optional[TextIO] = None
+        self._csv: Optional[csv.DictWriter] = None
+        if trace_path is not None:
+            self._open_trace(trace_path)
+
+    def _open_trace(self, path: str) -> None:
+        """
+        開啟紀錄檔並寫出開頭（CSV 標題列或 JSON 物件的開頭）。
+        """
+        if path.endswith(".json"):
+            self._trace_file = open(path, "w", encoding="utf-8")
+            self._trace_file.write(f'{{"phases": {json.dumps(list(PHASES))}, "frames": [')
+        else:
+            self._trace_file = open(path, "w", newline="", encoding="utf-8")
+            self._csv = csv.DictWriter(self._trace_file, fieldnames=["frame", *PHASES, "total", *COUNTERS])
+            self._csv.writeheader()
+
+    def start(self) -> float:
+        """
+        回傳階段開始的時間點；停用時回傳 0.0。
+        """
+        return time.perf_counter() if self.enabled else 0.0
+
+    def stop(self, phase: str, started: float) -> None:
+        """
+        將 started 到現在的時間（毫秒）累加到指定階段。
+        """
+        if self.enabled:
+            self.current[phase] += (time.perf_counter() - started) * 1000.0
+
+    def end_frame(self, calls: Dict[str, int]) -> None:
+        """
+        結束一幀：記錄各階段耗時與本幀的盤面呼叫次數。
+        :param calls: 盤面累計的呼叫次數（Board.calls）
+        """
+        if not self.enabled:
+            return
+        frame: Dict[str, float] = dict(self.current)
+        # drag 與 match 在事件迴圈內量測，events 只保留扣除兩者後的部分
+        frame["events"] = max(0.0, frame["events"] - frame["drag"] - frame["match"])
+        frame["total"] = sum(frame[phase] for phase in PHASES)
+        for name in COUNTERS:
+            frame[name] = calls.get(name, 0) - self._counts.get(name, calls.get(name, 0))
+        self._counts = dict(calls)
+        self.history.append(frame)
+        if self._trace_file is not None:
+            self._write_frame(frame)
+        self.current = dict.fromkeys(PHASES, 0.0)
+
+    def percentiles(self, key: str, points: Tuple[int, ...] = (50, 95, 99)) -> List[float]:
+        """
+        回傳最近幀數中指定欄位的百分位數。
+        """
+        values = sorted(frame[key] for frame in self.history)
+        if not values:
+            return [0.0 for _ in points]
+        return [values[min(len(values) - 1, len(values) * point // 100)] for point in points]
+
+    def summary_lines(self) -> List[str]:
+        """
+        回傳疊加層顯示的文字：每個階段的 p50 / p95 / p99（毫秒）與平均呼叫次數。
+        """
+        lines = [f"{'phase':>8}   p50    p95    p99"]
+        for key in PHASES + ("total",):
+            p50, p95, p99 = self.percentiles(key)
+            lines.append(f"{key:>8} {p50:5.2f}  {p95:5.2f}  {p99:5.2f}")
+        for name in COUNTERS:
+            average = sum(frame[name] for frame in self.history) / max(1, len(self.history))
+            lines.append(f"{name}: {average:.2f}/frame")
+        return lines
+
+    def _write_frame(self, frame: Dict[str, float]) -> None:
+        """
+        將一幀寫入紀錄檔。
+        """
+        if self._csv is not None:
+            self._csv.writerow({"frame": self._frames, **{key: round(value, 4) for key, value in frame.items()}})
+        else:
+            self._trace_file.write((", " if self._frames else "") + json.dumps(frame))
+        self._frames += 1
+
+    def close(self) -> None:
+        """
+        寫完紀錄檔的結尾並關閉檔案；沒有指定紀錄檔時不做任何事。
+        """
+        if self._trace_file is None:
+            return
+        if self._csv is None:
+            self._trace_file.write("]}")
+        self._trace_file.close()
+        self._trace_file, self._csv = None, None
@@ -0,0 +1,66 @@
+import pygame
+from board import BOARD_X, BOARD_Y, Board, TileManager
+from typing import Dict, List, Tuple
+
+
+class BoardRenderer:
+    """
+    將盤面（符石與格線）預先繪製在離屏 Surface 上，
+    每一幀只重畫 Board.dirty 中的格子，並回傳需要送出的畫面區域。
+    """
+
+    def __init__(self, board: Board) -> None:
+        """
+        建立與盤面同尺寸的離屏 Surface。
+        """
+        self.board: Board = board
+        self.surface: pygame.Surface = pygame.Surface((board.cols * board.tile_size, board.rows * board.tile_size))
+        self.rect: pygame.Rect = pygame.Rect(BOARD_X, BOARD_Y, *self.surface.get_size())
+
+    def invalidate(self) -> None:
+        """
+        標記整個盤面需要重畫。
+        """
+        self.board.dirty.update((row, col) for row in range(self.board.rows) for col in range(self.board.cols))
+
+    def update(self, images: Dict[str, pygame.Surface]) -> List[Tuple[int, int]]:
+        """
+        將髒格子重畫到離屏 Surface，回傳重畫過的格子並清空 Board.dirty。
+        """
+        size = self.board.tile_size
+        cells = list(self.board.dirty)
+        for row, col in cells:
+            x, y = col * size, row * size
+            self.surface.fill((0, 0, 0), (x, y, size, size))
+            TileManager.draw_cell(self.board.tiles[row][col], self.surface, images, x, y, size)
+        self.board.dirty.clear()
+        return cells
+
+    def draw(
+        self, screen: pygame.Surface, images: Dict[str, pygame.Surface], full: bool = False
+    ) -> List[pygame.Rect]:
+        """
+        將變動的格子從離屏 Surface 複製到畫布。
+        :param full: 是否複製整個盤面（例如畫布被其他畫面覆蓋過）
+        :return: 畫布上有變動的區域，供 pygame.display.update 使用
+        """
+        cells = self.update(images)
+        if full:
+            screen.blit(self.surface, self.rect)
+            return [self.rect.copy()]
+        size = self.board.tile_size
+        rects: List[pygame.Rect] = []
+        for row, col in cells:
+            area = pygame.Rect(col * size, row * size, size, size)
+            screen.blit(self.surface, (BOARD_X + area.x, BOARD_Y + area.y), area)
+            rects.append(area.move(BOARD_X, BOARD_Y))
+        return rects
+
+    def cell_center(self, cell: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        回傳格子中心在畫布上的座標。
+        """
+        row, col = cell
+        size = self.board.tile_size
+        return col * size + BOARD_X + size // 2, row * size + BOARD_Y + size // 2
+
@@ -0,0 +1,231 @@
+import argparse
+import hashlib
+import json
+import struct
+import sys
+import time
+from drag import decode_path, encode_path
+from levels import LevelSpec, LevelTable
+from state import GameState
+from stone_types import TYPE_CODES
+from typing import BinaryIO, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+MAGIC: bytes = b"TRPL"
+LOG_VERSION: int = 3  # 2: combo 改為計算相連同類型群組數；3: 檔頭加入關卡表
+DIGEST_SIZE: int = 8  # 每個狀態雜湊的位元組數
+
+# 檔頭：魔術字、版本、亂數種子、列數、行數、格子大小、敵人行走寬度、是否精簡盤面
+_HEADER = struct.Struct("<4sBQHHHH?")
+# 每筆紀錄的開頭：種類與發生時的邏輯影格（GameState.frame）
+_RECORD = struct.Struct("<cI")
+_LENGTH = struct.Struct("<H")
+_TABLE_LENGTH = struct.Struct("<I")  # 檔頭之後的關卡表（JSON）長度
+
+MOVE: bytes = b"M"  # 放開拖曳：壓縮路徑 + 結算後的狀態雜湊
+RESET: bytes = b"R"  # 失敗後按 R 重新開始
+UNDO: bytes = b"U"  # 復原上一次拖曳
+REDO: bytes = b"D"  # 重做被復原的拖曳
+END: bytes = b"E"  # 結束：尚未放開的拖曳路徑 + 最終狀態雜湊
+
+
+class Header(NamedTuple):
+    """
+    重現一場遊戲所需的初始設定。
+    """
+    seed: int
+    rows: int
+    cols: int
+    tile_size: int
+    field_width: int
+    compact: bool
+    levels: LevelTable
+
+
+class Record(NamedTuple):
+    """
+    紀錄檔中的一筆事件。
+    """
+    kind: bytes
+    frame: int
+    path: List[Tuple[int, int]]  # RESET / UNDO / REDO 為空
+    digest: bytes  # RESET / UNDO / REDO 為空
+
+
+class ReplayReport(NamedTuple):
+    """
+    重播結果。
+    """
+    ok: bool
+    moves: int
+    frames: int  # 重播推進的邏輯影格總數
+    seconds: float
+    mismatch: Optional[int]  # 第一筆雜湊不符的紀錄序號
+
+
+def state_hash(state: GameState) -> bytes:
+    """
+    計算遊戲狀態（盤面、敵人、計數與結果）的雜湊，用來比對錄製與重播是否一致。
+    """
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    hasher.update(bytes(255 if stone is None else TYPE_CODES[stone.type] for row in state.board.tiles for stone in row))
+    hasher.update(struct.pack(
+        "<IIidii??", state.frame, state.level, state.health, state.enemy_x,
+        state.traffic_tickets, state.combo, state.won, state.lost
+    ))
+    return hasher.digest()
+
+
+class Recorder:
+    """
+    將一場遊戲的種子與每次放開拖曳的路徑寫成精簡的二進位紀錄檔。
+    每筆紀錄都附上邏輯影格與結算後的狀態雜湊，重播時可找出第一個分歧點。
+    每筆紀錄寫入後立即 flush，程式異常結束時紀錄檔仍保留到最後一步。
+    """
+
+    def __init__(self, path: str, seed: int, state: GameState) -> None:
+        """
+        :param path: 紀錄檔路徑
+        :param seed: 建立 state 時使用的亂數種子
+        :param state: 要錄製的遊戲狀態（需剛以 seed 建立或重設）
+        """
+        self.state: GameState = state
+        self.file: BinaryIO = open(path, "wb")
+        board = state.board
+        table = json.dumps([list(spec) for spec in state.levels]).encode()
+        self._append(_HEADER.pack(
+            MAGIC, LOG_VERSION, seed, board.rows, board.cols, board.tile_size, state.field_width, board.compact
+        ) + _TABLE_LENGTH.pack(len(table)) + table)
+
+    def move(self, path: List[Tuple[int, int]], frame: int) -> None:
+        """
+        記錄一次放開拖曳，需在 GameState.resolve_move() 之後呼叫。
+        :param frame: 放開時（結算前）的邏輯影格
+        """
+        self._write(MOVE, frame, path)
+
+    def _write(self, kind: bytes, frame: int, path: List[Tuple[int, int]]) -> None:
+        data = encode_path(path)
+        self._append(_RECORD.pack(kind, frame) + _LENGTH.pack(len(data)) + data + state_hash(self.state))
+
+    def _append(self, data: bytes) -> None:
+        self.file.write(data)
+        self.file.flush()
+
+    def reset(self) -> None:
+        """
+        記錄重新開始，需在 GameState.reset() 之前呼叫。
+        """
+        self._append(_RECORD.pack(RESET, self.state.frame))
+
+    def undo(self) -> None:
+        """
+        記錄一次成功的 GameState.undo()。
+        """
+        self._append(_RECORD.pack(UNDO, self.state.frame))
+
+    def redo(self) -> None:
+        """
+        記錄一次成功的 GameState.redo()。
+        """
+        self._append(_RECORD.pack(REDO, self.state.frame))
+
+    def close(self, drag_path: Iterable[Tuple[int, int]] = ()) -> None:
+        """
+        寫入最終狀態雜湊並關閉檔案。
+        :param drag_path: 結束時仍在進行的拖曳（盤面已交換但尚未結算）
+        """
+        if self.file.closed:
+            return
+        self._write(END, self.state.frame, list(drag_path))
+        self.file.close()
+
+
+def read_log(data: bytes) -> Tuple[Header, List[Record]]:
+    """
+    解析紀錄檔內容。
+    :raises ValueError: 檔案格式或版本不符
+    """
+    magic, version, *fields = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != LOG_VERSION:
+        raise ValueError(f"not a version {LOG_VERSION} replay log")
+    (length,) = _TABLE_LENGTH.unpack_from(data, _HEADER.size)
+    offset = _HEADER.size + _TABLE_LENGTH.size
+    levels = tuple(
+        LevelSpec(level, enemy, health, tuple(size), speed)
+        for level, enemy, health, size, speed in json.loads(data[offset:offset + length])
+    )
+    return Header(*fields, levels), list(_records(data, offset + length))
+
+
+def _records(data: bytes, offset: int) -> Iterator[Record]:
+    while offset < len(data):
+        kind, frame = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        path: List[Tuple[int, int]] = []
+        digest = b""
+        if kind in (MOVE, END):
+            (length,) = _LENGTH.unpack_from(data, offset)
+            offset += _LENGTH.size
+            path = decode_path(data[offset:offset + length])
+            offset += length
+            digest = data[offset:offset + DIGEST_SIZE]
+            offset += DIGEST_SIZE
+        elif kind not in (RESET, UNDO, REDO):
+            raise ValueError(f"unknown record {kind!r} at byte {offset - _RECORD.size}")
+        yield Record(kind, frame, path, digest)
+
+
+def replay(header: Header, records: List[Record]) -> ReplayReport:
+    """
+    不開視窗、不限幀率地重新執行紀錄，逐筆比對狀態雜湊。
+    """
+    started = time.perf_counter()
+    state = GameState(
+        header.rows, header.cols, header.tile_size, header.field_width, header.seed, header.compact,
+        levels=header.levels
+    )
+    moves = frames = 0
+    for index, record in enumerate(records):
+        while state.frame < record.frame and not state.finished:
+            state.step()
+            frames += 1
+        if record.kind == MOVE:
+            state.apply_move(record.path)
+            moves += 1
+        elif record.kind == RESET:
+            state.reset()
+        elif record.kind == UNDO:
+            state.undo()
+        elif record.kind == REDO:
+            state.redo()
+        else:
+            state.board.apply_path(record.path)
+        if record.digest and record.digest != state_hash(state):
+            return ReplayReport(False, moves, frames, time.perf_counter() - started, index)
+    return ReplayReport(True, moves, frames, time.perf_counter() - started, None)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded sessions headlessly and verify state hashes.")
+    parser.add_argument("logs", nargs="+", help="replay logs written by game.py --record")
+    parser.add_argument("--repeat", type=int, default=1, help="replay each log this many times (for timing)")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for path in args.logs:
+        with open(path, "rb") as file:
+            header, records = read_log(file.read())
+        reports = [replay(header, records) for _ in range(args.repeat)]
+        best = min(report.seconds for report in reports)
+        report = reports[0]
+        status = "ok" if all(item.ok for item in reports) else f"MISMATCH at record {report.mismatch}"
+        print(
+            f"{path}: seed {header.seed}, {report.moves} moves, {report.frames} frames, "
+            f"{best * 1000:.2f} ms ({report.frames / max(best, 1e-9):,.0f} frames/s) {status}"
+        )
+        failed += status != "ok"
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,394 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from drag import DIRECTION_CODES
+from grid import EMPTY
+from levels import DEFAULT_LEVELS, LevelTable, load_levels
+from simulate import Policies
+from state import GameState, MoveResult
+from stone_types import TYPE_CODES
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+Cell = Tuple[int, int]
+Message = Dict[str, object]
+
+MAX_LINE: int = 16 * 1024  # 單一請求的最大位元組數
+
+
+def _is_int(value: object) -> bool:
+    """
+    JSON 整數檢查（bool 是 int 的子類別，需排除）。
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class Session:
+    """
+    一位玩家的對局：各自的盤面、敵人進度與亂數種子。
+    同一時間只允許一個尚未結算的拖曳，避免單一連線佔用無上限的記憶體。
+    """
+    __slots__ = ("id", "seed", "state", "busy", "last_active", "started")
+
+    def __init__(
+        self, session_id: int, seed: int, rows: int, cols: int, compact: bool, history: int, levels: LevelTable,
+        now: float
+    ) -> None:
+        """
+        :param now: 建立時的伺服器時鐘，敵人從此刻開始前進
+        """
+        self.id: int = session_id
+        self.seed: int = seed
+        self.state: GameState = GameState(rows, cols, seed=seed, compact=compact, history=history, levels=levels)
+        self.busy: bool = False
+        self.last_active: float = now
+        self.started: float = now  # 影格 0 對應的伺服器時鐘
+
+    def advance(self, now: float, logic_hz: int) -> None:
+        """
+        依伺服器時鐘推進敵人到目前應有的影格；時間完全由伺服器決定，客戶端無法讓敵人停下。
+        """
+        state = self.state
+        target = int((now - self.started) * logic_hz)
+        while state.frame < target and not state.finished:
+            state.step()
+
+    def snapshot(self) -> Message:
+        """
+        回傳敵人與計數的狀態（不含盤面）。
+        """
+        state = self.state
+        return {
+            "frame": state.frame, "level": state.level, "health": state.health, "max_health": state.max_health,
+            "enemy_x": state.enemy_x, "traffic_tickets": state.traffic_tickets, "combo": state.combo,
+            "won": state.won, "lost": state.lost,
+        }
+
+    def board_codes(self) -> List[List[int]]:
+        """
+        回傳整個盤面的類型代碼，空格為 EMPTY。
+        """
+        return [[EMPTY if stone is None else TYPE_CODES[stone.type] for stone in row] for row in self.state.board.tiles]
+
+    def take_changes(self) -> List[List[int]]:
+        """
+        回傳上次回應後內容有變動的格子 [row, col, code]，並清空盤面的 dirty 集合。
+        """
+        board = self.state.board
+        changes = []
+        for row, col in sorted(board.dirty):
+            stone = board.tiles[row][col]
+            changes.append([row, col, EMPTY if stone is None else TYPE_CODES[stone.type]])
+        board.dirty.clear()
+        return changes
+
+
+class GameServer:
+    """
+    在單一 asyncio 行程中執行多個無頭對局。
+    客戶端以換行分隔的 JSON 傳送請求，拖曳請求先排入佇列，由結算工作一次處理一批，
+    每批之間才讓出事件迴圈，減少每個請求各自排程的成本。
+    敵人依伺服器時鐘以 logic_hz 前進；每條連線只能操作自己建立的對局。
+
+    請求：
+      {"op": "new", "seed": 1}                               建立對局，回傳完整盤面
+      {"op": "move", "session": 1, "path": [[0, 0], [0, 1]]}
+                                                             推進到目前時間後執行拖曳，回傳連鎖與變動的格子
+      {"op": "reset", "session": 1}                          重新開始
+      {"op": "undo", "session": 1} / {"op": "redo", ...}      復原或重做上一次拖曳，回傳變動的格子
+      {"op": "close", "session": 1}                          結束對局
+    """
+
+    def __init__(
+        self,
+        rows: int = 5,
+        cols: int = 6,
+        max_sessions: int = 1000,
+        batch_size: int = 256,
+        idle_timeout: float = 300.0,
+        compact: bool = False,
+        history: int = 64,
+        levels: LevelTable = DEFAULT_LEVELS,
+        logic_hz: int = 60,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        :param max_sessions: 同時存在的對局上限
+        :param batch_size: 結算工作每批最多處理的拖曳數
+        :param idle_timeout: 超過此秒數沒有請求的對局會被移除
+        :param compact: 是否使用 NumPy 精簡盤面
+        :param history: 每個對局可 undo 的步數
+        :param levels: 所有對局共用的關卡表
+        :param logic_hz: 敵人每秒前進的邏輯影格數（與 game.py 相同）
+        :param clock: 伺服器時鐘（秒），測試時可替換成可控制的時鐘
+        """
+        self.rows: int = rows
+        self.cols: int = cols
+        self.max_sessions: int = max_sessions
+        self.batch_size: int = batch_size
+        self.idle_timeout: float = idle_timeout
+        self.compact: bool = compact
+        self.max_path: int = rows * cols * 4  # 單次拖曳的最大步數
+        self.history: int = history
+        self.levels: LevelTable = levels
+        self.logic_hz: int = logic_hz
+        self.clock: Callable[[], float] = clock
+        self.sessions: Dict[int, Session] = {}
+        self.stats: Dict[str, int] = {"moves": 0, "batches": 0}
+        self._ids = itertools.count(1)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        """
+        開始接受連線，並啟動結算與清理工作。
+        """
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._resolve_loop()), asyncio.create_task(self._evict_loop())]
+        return await asyncio.start_server(self._serve, host, port, limit=MAX_LINE)
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+    async def handle(self, message: Message, owned: Set[int]) -> Message:
+        """
+        處理一個請求並回傳回應；拖曳會等到所屬的批次結算完成。
+        :param owned: 發出請求的連線所建立的對局，只有這些對局可以操作
+        """
+        op = message.get("op")
+        if op == "new":
+            return self._new(message, owned)
+        session_id = message.get("session")
+        session = self.sessions.get(session_id) if _is_int(session_id) and session_id in owned else None
+        if session is None:
+            return {"ok": False, "error": "unknown session"}
+        session.last_active = self.clock()
+        if session.busy:
+            return {"ok": False, "error": "a move is already pending"}
+        if op == "move":
+            path = self._parse_path(message.get("path"))
+            if path is None:
+                return {"ok": False, "error": "invalid move"}
+            session.busy = True
+            future = asyncio.get_running_loop().create_future()
+            await self._queue.put((session, path, future))
+            return await future
+        if op == "reset":
+            session.state.reset()
+            session.started = session.last_active
+            session.state.board.dirty.clear()
+            return {"ok": True, "state": session.snapshot(), "board": session.board_codes()}
+        if op in ("undo", "redo"):
+            session.advance(session.last_active, self.logic_hz)
+            if not (session.state.undo() if op == "undo" else session.state.redo()):
+                return {"ok": False, "error": f"nothing to {op}"}
+            return {"ok": True, "state": session.snapshot(), "cells": session.take_changes()}
+        if op == "close":
+            del self.sessions[session.id]
+            owned.discard(session.id)
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown op {op!r}"}
+
+    def _new(self, message: Message, owned: Set[int]) -> Message:
+        if len(self.sessions) >= self.max_sessions:
+            return {"ok": False, "error": "server full"}
+        seed = message.get("seed")
+        if not _is_int(seed):
+            seed = random.randrange(2 ** 32)
+        session = Session(
+            next(self._ids), seed, self.rows, self.cols, self.compact, self.history, self.levels, self.clock()
+        )
+        session.state.board.dirty.clear()
+        self.sessions[session.id] = session
+        owned.add(session.id)
+        return {"ok": True, "session": session.id, "seed": seed, "state": session.snapshot(), "board": session.board_codes()}
+
+    def _parse_path(self, raw: object) -> Optional[List[Cell]]:
+        """
+        檢查拖曳路徑：格子都在盤面內，且每一步只移到相鄰格子。
+        """
+        if not isinstance(raw, list) or len(raw) > self.max_path + 1:
+            return None
+        path: List[Cell] = []
+        for cell in raw:
+            if not (isinstance(cell, list) and len(cell) == 2 and all(_is_int(value) for value in cell)):
+                return None
+            row, col = cell
+            if not (0 <= row < self.rows and 0 <= col < self.cols):
+                return None
+            if path and (row - path[-1][0], col - path[-1][1]) not in DIRECTION_CODES:
+                return None
+            path.append((row, col))
+        return path
+
+    async def _resolve_loop(self) -> None:
+        """
+        結算工作：取出佇列中累積的拖曳，一次結算一批後才讓出事件迴圈。
+        """
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            now = self.clock()
+            for session, path, future in batch:
+                session.busy = False
+                if session.id not in self.sessions:
+                    response: Message = {"ok": False, "error": "unknown session"}
+                else:
+                    session.advance(now, self.logic_hz)
+                    response = self._move_response(session, session.state.apply_move(path))
+                if not future.cancelled():  # 客戶端已斷線
+                    future.set_result(response)
+            self.stats["moves"] += len(batch)
+            self.stats["batches"] += 1
+            await asyncio.sleep(0)
+
+    @staticmethod
+    def _move_response(session: Session, result: MoveResult) -> Message:
+        return {
+            "ok": True,
+            "cascade": [
+                {
+                    "cleared": sorted(step.cleared),
+                    "combo": step.combo,
+                    "groups": [
+                        {"type": group.type.value, "size": group.size, "cells": sorted(group.cells)}
+                        for group in step.groups
+                    ],
+                    "falls": [list(fall) for fall in step.gravity.falls],
+                    "spawns": [[spawn.row, spawn.col, TYPE_CODES[spawn.stone.type]] for spawn in step.gravity.spawns],
+                }
+                for step in result.cascade
+            ],
+            "damage": result.damage,
+            "damage_by_type": {stone_type.value: damage for stone_type, damage in result.damage_by_type.items()},
+            "killed": result.killed,
+            "state": session.snapshot(),
+            "cells": session.take_changes(),
+        }
+
+    async def _evict_loop(self) -> None:
+        """
+        定期移除閒置過久的對局。
+        """
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 30.0))
+            deadline = self.clock() - self.idle_timeout
+            for session_id in [key for key, session in self.sessions.items() if session.last_active < deadline]:
+                del self.sessions[session_id]
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        owned: Set[int] = set()  # 此連線建立的對局，斷線時一併移除
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(b'{"ok": false, "error": "request too long"}\n')
+                    break
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    message = None
+                if isinstance(message, dict):
+                    response = await self.handle(message, owned)
+                else:
+                    response = {"ok": False, "error": "invalid request"}
+                writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session_id in owned:
+                self.sessions.pop(session_id, None)
+            writer.close()
+
+
+class Client:
+    """
+    GameServer 的簡易客戶端，一條連線可操作多個對局。
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader: asyncio.StreamReader = reader
+        self.writer: asyncio.StreamWriter = writer
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 8765) -> "Client":
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE * 16)
+        return cls(reader, writer)
+
+    async def request(self, **message: object) -> Message:
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def _bench(server: GameServer, host: str, port: int, players: int, moves: int) -> None:
+    """
+    以 players 個隨機拖曳的客戶端壓測伺服器。
+    """
+    async def play(seed: int) -> None:
+        client = await Client.connect(host, port)
+        reply = await client.request(op="new", seed=seed)
+        session_id = reply["session"]
+        walker = GameState(server.rows, server.cols)  # 只用來產生隨機路徑
+        rng = random.Random(seed)
+        for _ in range(moves):
+            path = Policies.random_walk(walker, rng)
+            reply = await client.request(op="move", session=session_id, path=path)
+            if reply["state"]["won"] or reply["state"]["lost"]:
+                reply = await client.request(op="reset", session=session_id)
+        await client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(play(seed) for seed in range(players)))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{players} players, {server.stats['moves']} moves in {elapsed:.2f} s "
+        f"({server.stats['moves'] / elapsed:,.0f} moves/s, {server.stats['moves'] / max(1, server.stats['batches']):.1f} moves/batch)"
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    server = GameServer(
+        max_sessions=args.max_sessions, batch_size=args.batch_size, compact=args.compact,
+        levels=load_levels(args.levels) if args.levels else DEFAULT_LEVELS
+    )
+    listener = await server.start(args.host, args.port)
+    async with listener:
+        if args.bench:
+            await _bench(server, args.host, args.port, args.bench, args.moves)
+        else:
+            print(f"serving on {args.host}:{args.port}", file=sys.stderr)
+            await listener.serve_forever()
+    server.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Host many headless game sessions over a line-delimited JSON socket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-sessions", type=int, default=1000, help="maximum concurrent sessions (default 1000)")
+    parser.add_argument("--batch-size", type=int, default=256, help="moves resolved per batch (default 256)")
+    parser.add_argument("--compact", action="store_true", help="store boards as NumPy grids")
+    parser.add_argument("--levels", metavar="PATH", help="level config for all sessions (default levels.json)")
+    parser.add_argument("--bench", type=int, metavar="PLAYERS", help="run a local load test with this many players")
+    parser.add_argument("--moves", type=int, default=50, help="moves per player in --bench (default 50)")
+    args = parser.parse_args(argv)
+    asyncio.run(_main(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
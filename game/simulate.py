@@ -0,0 +1,225 @@
+import argparse
+import itertools
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from levels import DEFAULT_LEVELS, LevelTable, load_levels, scale_levels
+from state import GameState
+from board import TileManager
+from solver import solve
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+Path = List[Tuple[int, int]]
+Policy = Callable[[GameState, random.Random], Path]
+NEIGHBOURS: Tuple[Tuple[int, int], ...] = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class GameReport(NamedTuple):
+    """
+    單場模擬的統計結果。
+    """
+    seed: int
+    won: bool
+    level: int  # 結束時所在的關卡
+    frames: int  # 總影格數
+    kill_frames: List[int]  # 每隻被擊倒的敵人花費的影格數
+    move_damage: List[int]  # 每次拖曳造成的傷害
+
+
+class Policies:
+    """
+    模擬用的拖曳策略，每個策略回傳一條格子路徑。
+    """
+
+    @staticmethod
+    def random_walk(state: GameState, rng: random.Random, length: int = 6) -> Path:
+        """
+        從隨機格子出發，隨機走相鄰格子（不立即折返）。
+        """
+        rows, cols = state.board.rows, state.board.cols
+        path: Path = [(rng.randrange(rows), rng.randrange(cols))]
+        while len(path) <= length:
+            row, col = path[-1]
+            back = path[-2] if len(path) > 1 else None
+            options = [
+                (row + d_row, col + d_col) for d_row, d_col in NEIGHBOURS
+                if 0 <= row + d_row < rows and 0 <= col + d_col < cols and (row + d_row, col + d_col) != back
+            ]
+            path.append(rng.choice(options))
+        return path
+
+    @staticmethod
+    def greedy_swap(state: GameState, rng: random.Random) -> Path:
+        """
+        嘗試所有相鄰交換，選出第一步消除最多格子的一步；沒有消除時退回隨機走。
+        """
+        tiles = state.board.tiles
+        best: Tuple[int, Optional[Path]] = (0, None)
+        for row in range(state.board.rows):
+            for col in range(state.board.cols):
+                for d_row, d_col in ((1, 0), (0, 1)):
+                    target = (row + d_row, col + d_col)
+                    if target[0] >= state.board.rows or target[1] >= state.board.cols:
+                        continue
+                    trial = TileManager.clone_tiles(tiles)
+                    TileManager.apply_path(trial, [(row, col), target])
+                    cleared = len(TileManager.check_matches(trial))
+                    if cleared > best[0]:
+                        best = (cleared, [(row, col), target])
+        return best[1] or Policies.random_walk(state, rng)
+
+    @staticmethod
+    def beam_solver(state: GameState, rng: random.Random) -> Path:
+        """
+        以 solver 的 beam search 找出最佳拖曳路徑；找不到消除時退回隨機走。
+        不設時間上限，讓同一種子的模擬結果不受機器負載影響。
+        """
+        return solve(state.board.tiles, time_budget=float("inf")).path or Policies.random_walk(state, rng)
+
+
+POLICIES: Dict[str, Policy] = {
+    "random": Policies.random_walk,
+    "greedy": Policies.greedy_swap,
+    "solver": Policies.beam_solver,
+}
+
+
+def play_game(
+    seed: int, policy: str = "greedy", move_interval: int = 60, compact: bool = False,
+    levels: LevelTable = DEFAULT_LEVELS
+) -> GameReport:
+    """
+    以指定種子與策略跑完一場無頭遊戲。
+    :param move_interval: 兩次拖曳之間經過的影格數（模擬玩家思考與拖曳時間）
+    :param levels: 使用的關卡表
+    """
+    rng = random.Random(seed)
+    state = GameState(seed=seed, compact=compact, levels=levels)
+    choose = POLICIES[policy]
+    kill_frames: List[int] = []
+    move_damage: List[int] = []
+    spawn_frame: int = 0
+    while not state.finished:
+        for _ in range(move_interval):
+            state.step()
+            if state.finished:
+                break
+        if state.finished:
+            break
+        result = state.apply_move(choose(state, rng))
+        move_damage.append(result.damage)
+        if result.killed:
+            kill_frames.append(state.frame - spawn_frame)
+            spawn_frame = state.frame
+    return GameReport(seed, state.won, state.level, state.frame, kill_frames, move_damage)
+
+
+def _play_game(args: Tuple[int, str, int, bool, LevelTable]) -> GameReport:
+    return play_game(*args)
+
+
+def _map_games(jobs: List[Tuple[int, str, int, bool, LevelTable]], workers: Optional[int]) -> List[GameReport]:
+    if workers == 1:
+        return [_play_game(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_play_game, jobs, chunksize=max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))))
+
+
+def run(
+    games: int, seed: int = 0, policy: str = "greedy", move_interval: int = 60,
+    workers: Optional[int] = None, compact: bool = False, levels: LevelTable = DEFAULT_LEVELS
+) -> List[GameReport]:
+    """
+    在多個行程中平行跑 games 場遊戲，第 i 場使用種子 seed + i。
+    """
+    return _map_games([(seed + i, policy, move_interval, compact, levels) for i in range(games)], workers)
+
+
+def sweep(
+    variants: Dict[str, LevelTable], games: int, seed: int = 0, policy: str = "greedy", move_interval: int = 60,
+    workers: Optional[int] = None, compact: bool = False
+) -> Dict[str, List[GameReport]]:
+    """
+    以相同的種子對每個關卡變體各跑 games 場，所有變體共用一個行程池。
+    """
+    jobs = [
+        (seed + i, policy, move_interval, compact, levels) for levels in variants.values() for i in range(games)
+    ]
+    reports = _map_games(jobs, workers)
+    return {name: reports[index * games:(index + 1) * games] for index, name in enumerate(variants)}
+
+
+def summarize(reports: List[GameReport], levels: LevelTable = DEFAULT_LEVELS) -> str:
+    """
+    彙整勝率、每隻敵人的擊倒時間與傷害分佈。
+    """
+    lines = [f"games: {len(reports)}  win rate: {sum(r.won for r in reports) / len(reports):.1%}"]
+    for index, name in enumerate(spec.enemy for spec in levels):
+        kills = [r.kill_frames[index] for r in reports if len(r.kill_frames) > index]
+        if kills:
+            lines.append(
+                f"{name}: killed {len(kills)}/{len(reports)}  time-to-kill frames "
+                f"mean {statistics.mean(kills):.0f}  median {statistics.median(kills):.0f}  max {max(kills)}"
+            )
+        else:
+            lines.append(f"{name}: never killed")
+    damage = [d for r in reports for d in r.move_damage]
+    if damage:
+        quartiles = statistics.quantiles(damage, n=4) if len(damage) > 1 else [damage[0]] * 3
+        lines.append(
+            f"damage per move: mean {statistics.mean(damage):.1f}  "
+            f"p25/p50/p75 {quartiles[0]:.0f}/{quartiles[1]:.0f}/{quartiles[2]:.0f}  "
+            f"max {max(damage)}  zero-damage moves {sum(d == 0 for d in damage) / len(damage):.1%}"
+        )
+    return "\n".join(lines)
+
+
+def summarize_sweep(results: Dict[str, List[GameReport]]) -> str:
+    """
+    每個關卡變體一行：勝率、平均結束關卡與平均影格數。
+    """
+    lines = [f"{'variant':<24} {'win':>7} {'level':>6} {'frames':>7}"]
+    for name, reports in results.items():
+        lines.append(
+            f"{name:<24} {sum(r.won for r in reports) / len(reports):>7.1%} "
+            f"{statistics.mean(r.level for r in reports):>6.2f} {statistics.mean(r.frames for r in reports):>7.0f}"
+        )
+    return "\n".join(lines)
+
+
+def _scales(text: str) -> List[float]:
+    return [float(value) for value in text.split(",")]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Monte Carlo balancing runner for headless games.")
+    parser.add_argument("--games", type=int, default=1000, help="number of games to simulate")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy", help="drag policy")
+    parser.add_argument("--move-interval", type=int, default=60, help="frames between two drags")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--compact", action="store_true", help="use the NumPy StoneGrid board")
+    parser.add_argument("--levels", metavar="PATH", help="level config to simulate (default levels.json)")
+    parser.add_argument(
+        "--health-scale", type=_scales, default=None, metavar="X,Y,...", help="sweep enemy health multipliers"
+    )
+    parser.add_argument(
+        "--speed-scale", type=_scales, default=None, metavar="X,Y,...", help="sweep enemy speed multipliers"
+    )
+    args = parser.parse_args(argv)
+    levels = load_levels(args.levels) if args.levels else DEFAULT_LEVELS
+    if args.health_scale or args.speed_scale:
+        variants = {
+            f"health x{health:g} speed x{speed:g}": scale_levels(levels, health, speed)
+            for health, speed in itertools.product(args.health_scale or [1.0], args.speed_scale or [1.0])
+        }
+        results = sweep(variants, args.games, args.seed, args.policy, args.move_interval, args.workers, args.compact)
+        print(summarize_sweep(results))
+        return
+    reports = run(args.games, args.seed, args.policy, args.move_interval, args.workers, args.compact, levels)
+    print(summarize(reports, levels))
+
+
+if __name__ == "__main__":
+    main()
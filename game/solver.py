@@ -0,0 +1,215 @@
+import random
+import time
+from board import TileManager
+from concurrent.futures import Executor
+from grid import EMPTY
+from stone_types import STONE_TYPES, TYPE_CODES
+from models import Runestone
+from state import DAMAGE_PER_TILE
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+Cell = Tuple[int, int]
+
+# Zobrist 雜湊表：每個 (格子, 符石類型) 與每個游標位置各一個 64 位元亂數
+_ZOBRIST_RNG = random.Random(0x5EED)
+_MAX_CELLS: int = 16 * 16
+ZOBRIST_STONES: List[List[int]] = [
+    [_ZOBRIST_RNG.getrandbits(64) for _ in STONE_TYPES] for _ in range(_MAX_CELLS)
+]
+ZOBRIST_CURSOR: List[int] = [_ZOBRIST_RNG.getrandbits(64) for _ in range(_MAX_CELLS)]
+
+
+class Solution(NamedTuple):
+    """
+    搜尋到的拖曳路徑與其評分。
+    """
+    path: List[Cell]  # 拖曳經過的格子，第一格為起點
+    damage: int  # 預估傷害（不計入隨機補充的符石）
+    combo: int  # 預估 combo 數（各步消除的相連同類型群組數）
+
+    @property
+    def score(self) -> Tuple[int, int, int]:
+        """
+        排序用的分數：傷害優先，其次 combo 數，最後偏好較短的路徑。
+        """
+        return self.damage, self.combo, -len(self.path)
+
+
+class _Node(NamedTuple):
+    codes: Tuple[int, ...]
+    cursor: int
+    key: int
+    path: Tuple[int, ...]
+    score: Tuple[int, int, int]
+
+
+class DragSolver:
+    """
+    以 beam search 搜尋拖曳路徑，並以 Zobrist 雜湊去除重複的盤面。
+    盤面以扁平化的類型代碼儲存，評分時只模擬消除與下落，不生成新的符石。
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        max_length: int = 12,
+        beam_width: int = 48,
+        time_budget: float = 0.008
+    ) -> None:
+        """
+        :param max_length: 路徑最多移動的步數
+        :param beam_width: 每一層保留的節點數
+        :param time_budget: 搜尋時間上限（秒），逾時回傳目前最佳解
+        """
+        if rows * cols > _MAX_CELLS:
+            raise ValueError(f"board too large for solver: {rows}x{cols}")
+        self.rows: int = rows
+        self.cols: int = cols
+        self.max_length: int = max_length
+        self.beam_width: int = beam_width
+        self.time_budget: float = time_budget
+        self.neighbours: List[Tuple[int, ...]] = [
+            tuple(
+                (row + d_row) * cols + col + d_col
+                for d_row, d_col in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                if 0 <= row + d_row < rows and 0 <= col + d_col < cols
+            )
+            for row in range(rows) for col in range(cols)
+        ]
+
+    @staticmethod
+    def encode(tiles: Sequence[Sequence[Optional[Runestone]]]) -> Tuple[int, ...]:
+        """
+        將盤面轉為扁平化的類型代碼。
+        """
+        return tuple(EMPTY if tile is None else TYPE_CODES[tile.type] for row in tiles for tile in row)
+
+    @staticmethod
+    def zobrist(codes: Sequence[int], cursor: Optional[int] = None) -> int:
+        """
+        計算盤面（與游標位置）的 Zobrist 雜湊。
+        """
+        key = 0 if cursor is None else ZOBRIST_CURSOR[cursor]
+        for cell, code in enumerate(codes):
+            if code != EMPTY:
+                key ^= ZOBRIST_STONES[cell][code]
+        return key
+
+    def evaluate(self, codes: Sequence[int]) -> Tuple[int, int]:
+        """
+        模擬消除與下落直到穩定，回傳 (傷害, combo 數)。
+        """
+        rows, cols = self.rows, self.cols
+        board = list(codes)
+        cleared_total, combo = 0, 0
+        while True:
+            matched = set()
+            for row in range(rows):
+                base = row * cols
+                for col in range(cols - 2):
+                    code = board[base + col]
+                    if code != EMPTY and code == board[base + col + 1] == board[base + col + 2]:
+                        matched.update((base + col, base + col + 1, base + col + 2))
+            for col in range(cols):
+                for row in range(rows - 2):
+                    cell = row * cols + col
+                    code = board[cell]
+                    if code != EMPTY and code == board[cell + cols] == board[cell + 2 * cols]:
+                        matched.update((cell, cell + cols, cell + 2 * cols))
+            if not matched:
+                return cleared_total * DAMAGE_PER_TILE, combo
+            combo += len(TileManager.label_groups({cell: board[cell] for cell in matched}, cols))
+            cleared_total += len(matched)
+            for cell in matched:
+                board[cell] = EMPTY
+            for col in range(cols):
+                stack = [board[row * cols + col] for row in range(rows) if board[row * cols + col] != EMPTY]
+                stack = [EMPTY] * (rows - len(stack)) + stack
+                for row in range(rows):
+                    board[row * cols + col] = stack[row]
+
+    def solve(
+        self,
+        tiles: Sequence[Sequence[Optional[Runestone]]],
+        starts: Optional[Iterable[Cell]] = None,
+        executor: Optional[Executor] = None
+    ) -> Solution:
+        """
+        搜尋最佳拖曳路徑。
+        :param starts: 允許的起點格子（預設為全部格子）
+        :param executor: 指定時每一列的起點各自在 executor 上平行搜尋
+        """
+        codes = self.encode(tiles)
+        cells = [row * self.cols + col for row, col in starts] if starts is not None else list(range(len(codes)))
+        if executor is None:
+            return self._search(codes, cells)
+        chunks = [
+            [cell for cell in cells if cell // self.cols == row] for row in range(self.rows)
+        ]
+        futures = [executor.submit(self._search, codes, chunk) for chunk in chunks if chunk]
+        return max((future.result() for future in futures), key=lambda solution: solution.score)
+
+    def _search(self, codes: Tuple[int, ...], starts: List[int]) -> Solution:
+        """
+        從指定起點執行 beam search；每一層展開游標的相鄰格子並以雜湊去重。
+        """
+        deadline = time.perf_counter() + self.time_budget
+        board_key = self.zobrist(codes)
+        beam: List[_Node] = [
+            _Node(codes, cell, board_key ^ ZOBRIST_CURSOR[cell], (cell,), (0, 0, 0)) for cell in starts
+        ]
+        seen = {node.key for node in beam}
+        best: Optional[_Node] = None
+        for _ in range(self.max_length):
+            children: List[_Node] = []
+            for node in beam:
+                previous = node.path[-2] if len(node.path) > 1 else -1
+                here = node.codes[node.cursor]
+                for target in self.neighbours[node.cursor]:
+                    if target == previous:
+                        continue
+                    there = node.codes[target]
+                    # 交換游標與目標格的符石，雜湊只需更新兩格與游標位置
+                    key = node.key ^ ZOBRIST_CURSOR[node.cursor] ^ ZOBRIST_CURSOR[target]
+                    if here != there:
+                        if here != EMPTY:
+                            key ^= ZOBRIST_STONES[node.cursor][here] ^ ZOBRIST_STONES[target][here]
+                        if there != EMPTY:
+                            key ^= ZOBRIST_STONES[target][there] ^ ZOBRIST_STONES[node.cursor][there]
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    board = list(node.codes)
+                    board[node.cursor], board[target] = there, here
+                    path = node.path + (target,)
+                    damage, combo = self.evaluate(board)
+                    children.append(_Node(tuple(board), target, key, path, (damage, combo, -len(path))))
+                if time.perf_counter() > deadline:
+                    break
+            if not children:
+                break
+            children.sort(key=lambda child: child.score, reverse=True)
+            beam = children[:self.beam_width]
+            if best is None or beam[0].score > best.score:
+                best = beam[0]
+            if time.perf_counter() > deadline:
+                break
+        if best is None or best.score[0] == 0:  # 沒有任何路徑能造成消除
+            return Solution([], 0, 0)
+        return Solution([divmod(cell, self.cols) for cell in best.path], best.score[0], best.score[1])
+
+
+def solve(
+    tiles: Sequence[Sequence[Optional[Runestone]]],
+    max_length: int = 12,
+    beam_width: int = 48,
+    time_budget: float = 0.008,
+    starts: Optional[Iterable[Cell]] = None,
+    executor: Optional[Executor] = None
+) -> Solution:
+    """
+    以預設參數建立 DragSolver 並搜尋最佳拖曳路徑；沒有路徑能造成消除時回傳空路徑。
+    """
+    solver = DragSolver(len(tiles), len(tiles[0]), max_length, beam_width, time_budget)
+    return solver.solve(tiles, starts, executor)
@@ -0,0 +1,219 @@
+import random
+from board import Board, BoardSnapshot, CascadeStep
+from history import SnapshotRing
+from levels import DEFAULT_LEVELS, LevelSpec, LevelTable
+from stone_types import StoneType
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+DAMAGE_PER_TILE: int = 10  # 每消除一顆符石造成的傷害
+
+
+class MoveResult(NamedTuple):
+    """
+    一次拖曳結算後的結果。
+    """
+    cascade: List[CascadeStep]  # 連鎖消除的每一步
+    damage: int  # 本次拖曳造成的傷害
+    killed: bool  # 是否擊倒了當前敵人
+    damage_by_type: Dict[StoneType, int]  # 各類型符石造成的傷害
+
+
+class GameSnapshot(NamedTuple):
+    """
+    一次拖曳結算後的遊戲狀態（不含影格數），供 undo / redo 使用。
+    """
+    board: BoardSnapshot
+    level: int
+    current_enemy_index: int
+    max_health: int
+    health: int
+    enemy_x: float
+    enemy_speed: float
+    traffic_tickets: int
+    combo: int
+    won: bool
+    lost: bool
+
+
+class GameState:
+    """
+    不依賴 pygame 的遊戲規則核心：盤面、敵人移動、傷害與關卡推進。
+    GameManager 只負責輸入與繪製，模擬器可直接呼叫 step / apply_move。
+    """
+
+    def __init__(
+        self,
+        rows: int = 5,
+        cols: int = 6,
+        tile_size: int = 100,
+        field_width: int = 720,
+        seed: Optional[int] = None,
+        compact: bool = False,
+        history: int = 256,
+        levels: LevelTable = DEFAULT_LEVELS
+    ) -> None:
+        """
+        初始化遊戲狀態。
+        :param field_width: 敵人行走區域的寬度，敵人走出右邊即失敗
+        :param seed: 亂數種子，指定時盤面與補充的符石可重現
+        :param compact: 是否使用 NumPy 精簡盤面
+        :param history: 可以 undo 的最大步數
+        :param levels: 編譯後的關卡表（預設為 levels.json）
+        """
+        self.rng: random.Random = random.Random(seed)
+        self.board: Board = Board(rows, cols, tile_size, compact, self.rng)
+        self.field_width: int = field_width
+
+        # 敵人參數：每關一筆的不可變關卡表，換關只需切換索引
+        self.levels: LevelTable = levels
+        self.spec: LevelSpec = levels[0]  # 當前關卡的參數
+        self._reset_counters()
+        self.start_level(1)
+        self.history: SnapshotRing[GameSnapshot] = SnapshotRing(history)
+        self._settled: GameSnapshot = self.snapshot()  # 上一次結算後的狀態
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """
+        回到第一關重新開始：重新生成盤面並重設敵人、計數與速度，沿用同一個 Board 物件。
+        :param seed: 指定時重新設定亂數種子
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        self.board.reset()
+        self._reset_counters()
+        self.start_level(1)
+        self.history.clear()
+        self._settled = self.snapshot()
+
+    def start_level(self, level: int) -> None:
+        """
+        進入指定關卡：換上該關的敵人、補滿血量並將敵人放回起始位置。
+        """
+        self.level = level
+        self.current_enemy_index = level - 1
+        self.spec = self.levels[self.current_enemy_index]
+        self.max_health = self.spec.health
+        self.health = self.max_health
+        self.enemy_x = -self.spec.size[0]  # 起始位置
+        self.enemy_speed = self.spec.speed
+
+    def _reset_counters(self) -> None:
+        self.level: int = 1
+        self.traffic_tickets: int = 0
+        self.combo: int = 0
+        self.frame: int = 0  # 已經過的模擬影格數
+        self.current_enemy_index: int = 0
+        self.max_health: int = 0
+        self.health: int = 0
+        self.enemy_x: float = 0.0
+        self.enemy_speed: float = self.levels[0].speed
+
+        # 結果
+        self.won: bool = False
+        self.lost: bool = False
+
+    @property
+    def finished(self) -> bool:
+        """
+        遊戲是否已結束（勝利或失敗）。
+        """
+        return self.won or self.lost
+
+    def step(self) -> None:
+        """
+        推進一個影格：敵人前進，走出右邊即判定失敗。
+        """
+        if self.finished:
+            return
+        self.frame += 1
+        self.enemy_x += self.enemy_speed
+        if self.enemy_x > self.field_width:  # 敵人走出畫布右邊
+            self.lost = True
+
+    def apply_move(self, path: Iterable[Tuple[int, int]]) -> MoveResult:
+        """
+        以格子路徑執行一次拖曳並結算連鎖、傷害與關卡推進；遊戲已結束時不改動盤面。
+        """
+        if self.finished:
+            return MoveResult([], 0, False, {})
+        self.board.apply_path(path)
+        return self.resolve_move()
+
+    def resolve_move(self) -> MoveResult:
+        """
+        拖曳結束後結算盤面：消除連鎖、扣除敵人血量，擊倒時進入下一關。
+        """
+        if self.finished:
+            return MoveResult([], 0, False, {})
+        self.history.push(self._settled)
+        cascade = self.board.resolve_cascades()
+        damage_by_type: Dict[StoneType, int] = {}
+        for step in cascade:
+            for group in step.groups:
+                damage_by_type[group.type] = damage_by_type.get(group.type, 0) + group.size * DAMAGE_PER_TILE
+        damage: int = sum(damage_by_type.values())
+        self.combo += sum(step.combo for step in cascade)
+        self.health -= damage
+        self.traffic_tickets += damage
+        killed: bool = bool(cascade) and self.health <= 0
+        if killed:
+            self._advance_level()
+        self._settled = self.snapshot()
+        return MoveResult(cascade, damage, killed, damage_by_type)
+
+    def snapshot(self) -> GameSnapshot:
+        """
+        回傳目前狀態的快照（盤面需穩定）。
+        """
+        return GameSnapshot(
+            self.board.snapshot(), self.level, self.current_enemy_index, self.max_health, self.health,
+            self.enemy_x, self.enemy_speed, self.traffic_tickets, self.combo, self.won, self.lost
+        )
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """
+        還原快照中的盤面、敵人與計數；影格數不變。
+        """
+        self.board.restore(snapshot.board)
+        (
+            _, self.level, self.current_enemy_index, self.max_health, self.health,
+            self.enemy_x, self.enemy_speed, self.traffic_tickets, self.combo, self.won, self.lost
+        ) = snapshot
+        self.spec = self.levels[self.current_enemy_index]
+        self._settled = snapshot
+
+    def undo(self) -> bool:
+        """
+        回到上一次拖曳之前（放棄進行中的拖曳）；沒有紀錄或遊戲已結束時回傳 False。
+        同一隻敵人的位置不會倒回，只有復活被擊倒的敵人時才還原其位置。
+        """
+        if self.finished:  # 勝負已定，不能靠 undo 撤銷
+            return False
+        return self._step_history(self.history.undo(self._settled))
+
+    def redo(self) -> bool:
+        """
+        重做上一次 undo 的拖曳；沒有紀錄或遊戲已結束時回傳 False。
+        """
+        if self.finished:
+            return False
+        return self._step_history(self.history.redo(self._settled))
+
+    def _step_history(self, snapshot: Optional[GameSnapshot]) -> bool:
+        if snapshot is None:
+            return False
+        enemy_x, level = self.enemy_x, self.level
+        self.restore(snapshot)
+        if self.level == level:
+            self.enemy_x = enemy_x  # 時間不會倒流：同一隻敵人保持目前的位置
+        return True
+
+    def _advance_level(self) -> None:
+        """
+        進入下一關，或在最後一關擊倒敵人後判定勝利。
+        """
+        if self.level + 1 > len(self.levels):
+            self.level += 1
+            self.won = True
+            return
+        self.start_level(self.level + 1)
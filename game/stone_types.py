@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Dict, Tuple
 
 class StoneType(Enum):
     """
@@ -8,4 +9,9 @@ class StoneType(Enum):
     BUS: str = "bus"           # 公車符石
     BIKE: str = "bike"         # 自行車符石
     SCOOTER: str = "scooter"   # 機車符石
-    TRAIN: str = "train"       # 火車符石
\ No newline at end of file
+    TRAIN: str = "train"       # 火車符石
+
+
+# 預先計算的類型表：避免每次抽選都重建 list(StoneType)
+STONE_TYPES: Tuple[StoneType, ...] = tuple(StoneType)
+TYPE_CODES: Dict[StoneType, int] = {stone_type: code for code, stone_type in enumerate(STONE_TYPES)}
\ No newline at end of file
@@ -0,0 +1,74 @@
+import os
+import shutil
+import pytest
+
+pygame = pytest.importorskip("pygame")
+from assets import AssetPack, decode_pack, encode_pack  # noqa: E402
+IMAGE_DIR = os.path.join(os.path.dirname(__file__), "Image")
+
+
+@pytest.fixture
+def display(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((10, 10))
+    yield
+    pygame.display.quit()
+
+
+@pytest.fixture
+def sources(tmp_path):
+    """
+    複製兩張來源圖片到暫存目錄，回傳 (圖片路徑, 尺寸, 包檔路徑)。
+    """
+    paths = {}
+    for name in ("car", "bus"):
+        paths[name] = str(tmp_path / f"{name}.png")
+        shutil.copy(os.path.join(IMAGE_DIR, f"{name}.png"), paths[name])
+    return paths, {name: (12, 10) for name in paths}, str(tmp_path / "assets.pack")
+
+
+def test_missing_source_fails_only_that_image(display, sources):
+    paths, sizes, pack_path = sources
+    paths = {"gone": os.path.join(os.path.dirname(pack_path), "gone.png"), **paths}
+    sizes = {"gone": (12, 10), **sizes}
+    pack = AssetPack(paths, sizes, pack_path).load()
+    pack.wait()
+    assert pack["car"].get_size() == (12, 10)
+    assert pack["bus"].get_size() == (12, 10)
+    with pytest.raises(FileNotFoundError):
+        pack["gone"]
+
+
+def test_corrupt_pack_entry_is_reloaded_from_source(display, sources, monkeypatch):
+    """
+    包檔中的像素資料損壞時視為快取未命中，改由來源檔載入，背景執行緒照常處理其餘圖片。
+    """
+    paths, sizes, pack_path = sources
+    mtime = os.stat(paths["car"]).st_mtime_ns
+    monkeypatch.setattr(AssetPack, "_read_pack", lambda self: {"car": (mtime, (12, 10), "RGBA", b"short")})
+    pack = AssetPack(paths, sizes, pack_path).load()
+    pack.wait()
+    assert pack["car"].get_size() == (12, 10)
+    assert pack["bus"].get_size() == (12, 10)
+
+
+def test_pack_round_trip_and_rejects_garbage(display, sources):
+    """
+    包檔是純資料格式：寫回後可完整讀回，截斷或其他格式的檔案一律當作沒有快取。
+    """
+    paths, sizes, pack_path = sources
+    AssetPack(paths, sizes, pack_path).load().wait()
+    with open(pack_path, "rb") as file:
+        data = file.read()
+    entries = decode_pack(data)
+    assert sorted(entries) == ["bus", "car"]
+    assert encode_pack(entries) == data
+    for garbage in (data[:-1], data[:10], b"\x80\x04pickle", b""):
+        with pytest.raises(ValueError):
+            decode_pack(garbage)
+        with open(pack_path, "wb") as file:
+            file.write(garbage)
+        pack = AssetPack(paths, sizes, pack_path).load()
+        pack.wait()
+        assert pack["car"].get_size() == (12, 10)
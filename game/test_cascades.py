@@ -0,0 +1,29 @@
+import random
+import pytest
+from board import Board, TileManager
+from grid import HAS_NUMPY
+
+BACKENDS = [False, True] if HAS_NUMPY else [False]
+
+
+def _random_path(rows, cols, length, rng):
+    path = [(rng.randrange(rows), rng.randrange(cols))]
+    for _ in range(length):
+        row, col = path[-1]
+        d_row, d_col = rng.choice(((-1, 0), (1, 0), (0, -1), (0, 1)))
+        path.append((min(max(row + d_row, 0), rows - 1), min(max(col + d_col, 0), cols - 1)))
+    return path
+
+
+@pytest.mark.parametrize("compact", BACKENDS)
+def test_no_matches_after_cascades(compact):
+    """
+    resolve_cascades 之後盤面沒有三消也沒有空格。
+    """
+    rng = random.Random(2)
+    for seed in range(100):
+        board = Board(6, 7, 80, compact, rng=seed)
+        board.apply_path(_random_path(6, 7, 40, rng))
+        board.resolve_cascades()
+        assert not TileManager.has_initial_matches(board.tiles)
+        assert all(stone is not None for row in board.tiles for stone in row)
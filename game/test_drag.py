@@ -0,0 +1,90 @@
+import random
+import pytest
+from board import BOARD_X, BOARD_Y, Board, TileManager
+from drag import DragInput, decode_path, encode_path
+
+TILE_SIZE = 80
+
+
+def _center(cell):
+    row, col = cell
+    return BOARD_X + col * TILE_SIZE + TILE_SIZE // 2, BOARD_Y + row * TILE_SIZE + TILE_SIZE // 2
+
+
+def _assert_adjacent(path):
+    for (row, col), (next_row, next_col) in zip(path, path[1:]):
+        assert abs(row - next_row) + abs(col - next_col) == 1
+
+
+def test_walk_cells_steps_to_the_end_one_neighbour_at_a_time():
+    """
+    walk_cells 每一步只移動到上下左右相鄰的格子，走最短的步數並停在終點。
+    """
+    rng = random.Random(1)
+    for _ in range(500):
+        start = (rng.randrange(10), rng.randrange(10))
+        end = (rng.randrange(10), rng.randrange(10))
+        cells = TileManager.walk_cells(start, end)
+        assert len(cells) == abs(start[0] - end[0]) + abs(start[1] - end[1])
+        assert (cells[-1] if cells else start) == end
+        _assert_adjacent([start] + cells)
+        rows, cols = sorted((start[0], end[0])), sorted((start[1], end[1]))
+        assert all(rows[0] <= row <= rows[1] and cols[0] <= col <= cols[1] for row, col in cells)
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 4, 5, 9, 300])
+def test_encode_decode_round_trip(length):
+    """
+    encode_path / decode_path 可還原任意長度的相鄰路徑；每 4 步只佔 1 個位元組。
+    """
+    rng = random.Random(length)
+    path = [(rng.randrange(6), rng.randrange(7))] if length else []
+    while 0 < len(path) < length:
+        row, col = path[-1]
+        d_row, d_col = rng.choice(((-1, 0), (1, 0), (0, -1), (0, 1)))
+        path.append((row + d_row, col + d_col))
+    data = encode_path(path)
+    assert decode_path(data) == path
+    assert len(data) == (0 if not path else 6 + (len(path) + 2) // 4)
+
+
+def test_encode_rejects_non_adjacent_cells():
+    """
+    路徑中有不相鄰的兩格時拒絕編碼。
+    """
+    with pytest.raises(ValueError):
+        encode_path([(0, 0), (1, 1)])
+
+
+def test_fast_swipe_is_coalesced_and_interpolated():
+    """
+    同一幀內的多個移動事件只處理最後一個位置；跳過的格子逐格補上，效果與照路徑拖曳相同。
+    """
+    board = Board(6, 7, TILE_SIZE, rng=4)
+    expected = [list(row) for row in board.tiles]
+    drag = DragInput(board)
+    drag.press(_center((0, 0)))
+    for cell in ((0, 1), (2, 2), (5, 3)):  # 同一幀內的三個事件
+        drag.move(_center(cell))
+    assert board.drag_path == [(0, 0)]
+    drag.flush()
+    drag.move(_center((1, 6)))
+    path = drag.release()
+    assert path[0] == (0, 0) and (5, 3) in path and path[-1] == (1, 6)
+    _assert_adjacent(path)
+    assert decode_path(drag.last_swaps) == path
+    TileManager.apply_path(expected, path)
+    assert TileManager.encode_tiles(board.tiles) == TileManager.encode_tiles(expected)
+    assert not drag.active and board.drag_path == []
+
+
+def test_press_outside_the_board_does_not_start_a_drag():
+    """
+    按在盤面外不會啟動拖曳，之後的移動也不會交換任何符石。
+    """
+    board = Board(6, 7, TILE_SIZE, rng=4)
+    drag = DragInput(board)
+    drag.press((0, 0))
+    drag.move(_center((2, 2)))
+    drag.flush()
+    assert not drag.active and drag.release() == []
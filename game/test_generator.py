@@ -0,0 +1,39 @@
+import random
+import pytest
+from board import Board, TileManager
+
+
+@pytest.mark.parametrize("size", [(3, 3), (5, 6), (6, 7), (12, 12)])
+def test_generated_board_has_no_initial_matches(size):
+    """
+    建構出的盤面一開始就沒有任何三消，且每一格都有符石。
+    """
+    rows, cols = size
+    rng = random.Random(rows * 100 + cols)
+    for _ in range(50):
+        tiles = TileManager.generate_board(rows, cols, rng)
+        assert len(tiles) == rows and all(len(row) == cols for row in tiles)
+        assert all(stone is not None for row in tiles for stone in row)
+        assert not TileManager.has_initial_matches(tiles)
+
+
+def test_same_seed_gives_same_board():
+    """
+    同一個種子（或相同狀態的 random.Random）產生相同的盤面；不同種子產生不同盤面。
+    """
+    encode = TileManager.encode_tiles
+    assert encode(TileManager.generate_board(6, 7, 42)) == encode(TileManager.generate_board(6, 7, 42))
+    assert encode(TileManager.generate_board(6, 7, random.Random(42))) == encode(TileManager.generate_board(6, 7, 42))
+    assert encode(TileManager.generate_board(6, 7, 42)) != encode(TileManager.generate_board(6, 7, 43))
+    assert encode(Board(6, 7, 80, rng=9).tiles) == encode(Board(6, 7, 80, rng=9).tiles)
+
+
+def test_generator_leaves_global_random_alone():
+    """
+    指定種子時只使用自己的亂數產生器，不影響 random 模組的共用序列。
+    """
+    random.seed(3)
+    expected = random.random()
+    random.seed(3)
+    TileManager.generate_board(6, 7, 5)
+    assert random.random() == expected
@@ -0,0 +1,48 @@
+import random
+from board import Board, TileManager
+from models import STONES
+
+
+def _random_tiles(rows, cols, density, types, rng):
+    return [
+        [rng.choice(STONES[:types]) if rng.random() < density else None for _ in range(cols)] for _ in range(rows)
+    ]
+
+
+def _reference_gravity(tiles, columns):
+    """
+    逐行把符石往下壓實的直觀實作（空格留在上方），用來對照 apply_gravity。
+    """
+    rows = len(tiles)
+    for col in columns:
+        stones = [tiles[row][col] for row in range(rows) if tiles[row][col] is not None]
+        for row, stone in enumerate([None] * (rows - len(stones)) + stones):
+            tiles[row][col] = stone
+
+
+def test_gravity_matches_reference():
+    """
+    下落後的盤面與逐行壓實的參考實作相同，且補充的格子正好是壓實後的空格。
+    """
+    rng = random.Random(1)
+    for trial in range(500):
+        rows, cols = rng.randint(1, 12), rng.randint(1, 12)
+        tiles = _random_tiles(rows, cols, rng.choice((1.0, 0.7, 0.3)), 5, rng)
+        columns = sorted({rng.randrange(cols) for _ in range(rng.randint(1, cols))})
+        expected = [row[:] for row in tiles]
+        _reference_gravity(expected, columns)
+        result = TileManager.apply_gravity(tiles, rows, cols, random.Random(trial), columns)
+        for spawn in result.spawns:
+            assert expected[spawn.row][spawn.col] is None
+            expected[spawn.row][spawn.col] = spawn.stone
+        assert tiles == expected
+
+
+def test_board_gravity_fills_every_column_by_default():
+    """
+    不指定行時 Board.apply_gravity 會補滿所有行的空格，不論空格是怎麼產生的。
+    """
+    board = Board(5, 6, 80, rng=1)
+    board.tiles[0][0] = board.tiles[4][3] = board.tiles[2][5] = None
+    board.apply_gravity()
+    assert all(stone is not None for row in board.tiles for stone in row)
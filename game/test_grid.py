@@ -0,0 +1,72 @@
+import random
+import pytest
+from board import Board, TileManager
+from grid import HAS_NUMPY, StoneGrid
+from models import STONES
+
+pytestmark = pytest.mark.skipif(not HAS_NUMPY, reason="StoneGrid requires numpy")
+
+
+def _random_tiles(rows, cols, density, types, rng):
+    return [
+        [rng.choice(STONES[:types]) if rng.random() < density else None for _ in range(cols)] for _ in range(rows)
+    ]
+
+
+def _random_path(rows, cols, length, rng):
+    path = [(rng.randrange(rows), rng.randrange(cols))]
+    for _ in range(length):
+        row, col = path[-1]
+        d_row, d_col = rng.choice(((-1, 0), (1, 0), (0, -1), (0, 1)))
+        path.append((min(max(row + d_row, 0), rows - 1), min(max(col + d_col, 0), cols - 1)))
+    return path
+
+
+def _groups(groups):
+    return {(group.type, group.cells) for group in groups}
+
+
+def _types(tiles):
+    return [[None if stone is None else stone.type for stone in row] for row in tiles]
+
+
+def test_stone_grid_matches_list_board():
+    """
+    StoneGrid 的消除分組、下落補充與拖曳結果與 List 盤面完全相同。
+    """
+    rng = random.Random(0)
+    for trial in range(500):
+        rows, cols = rng.randint(1, 10), rng.randint(1, 10)
+        tiles = _random_tiles(rows, cols, rng.choice((1.0, 0.7, 0.3)), rng.choice((2, 3, 5)), rng)
+        grid = StoneGrid.from_tiles(tiles)
+        subset = {} if rng.random() < 0.5 else {"rows": {rng.randrange(rows)}, "cols": {rng.randrange(cols)}}
+        groups = TileManager.check_groups(tiles, **subset)
+        grid_groups = TileManager.check_groups(grid, **subset)
+        assert len(groups) == len(grid_groups) and set(groups) == set(grid_groups)
+        assert _types(tiles) == _types(grid)
+        columns = None if rng.random() < 0.5 else {rng.randrange(cols) for _ in range(2)}
+        gravity = TileManager.apply_gravity(tiles, rows, cols, random.Random(trial), columns)
+        assert gravity == TileManager.apply_gravity(grid, rows, cols, random.Random(trial), columns)
+        assert _types(tiles) == _types(grid)
+        path = _random_path(rows, cols, 20, rng)
+        TileManager.apply_path(tiles, path)
+        TileManager.apply_path(grid, path)
+        assert _types(tiles) == _types(grid)
+
+
+def test_cascades_match_across_backends():
+    """
+    同一個種子與拖曳在兩種盤面上產生相同的連鎖步驟與最終盤面。
+    """
+    rng = random.Random(3)
+    for seed in range(100):
+        path = _random_path(5, 6, 30, rng)
+        boards = [Board(5, 6, 80, compact, rng=seed) for compact in (False, True)]
+        steps = []
+        for board in boards:
+            board.apply_path(path)
+            steps.append([
+                (step.cleared, step.combo, _groups(step.groups), step.gravity) for step in board.resolve_cascades()
+            ])
+        assert steps[0] == steps[1]
+        assert _types(boards[0].tiles) == _types(boards[1].tiles)
@@ -0,0 +1,68 @@
+import random
+import pytest
+from grid import HAS_NUMPY
+from replay import state_hash
+from simulate import Policies
+from state import GameState
+
+BACKENDS = [False, True] if HAS_NUMPY else [False]
+
+
+@pytest.mark.parametrize("compact", BACKENDS)
+def test_undo_redo_round_trip(compact):
+    """
+    undo 逐步回到每次拖曳前的狀態，redo 逐步回到拖曳後；undo 後重做同一拖曳得到相同的補充符石。
+    """
+    state = GameState(seed=5, compact=compact)
+    rng = random.Random(5)
+    hashes, paths = [state_hash(state)], []
+    while len(paths) < 30 and not state.finished:
+        paths.append(Policies.random_walk(state, rng))
+        state.apply_move(paths[-1])
+        hashes.append(state_hash(state))
+    for expected in reversed(hashes[:-1]):
+        assert state.undo()
+        assert state_hash(state) == expected
+    assert not state.undo()
+    for expected in hashes[1:]:
+        assert state.redo()
+        assert state_hash(state) == expected
+    assert not state.redo()
+    state.undo()
+    state.apply_move(paths[-1])
+    assert state_hash(state) == hashes[-1]
+
+
+def test_restore_leaves_global_random_alone():
+    """
+    undo / redo 只使用盤面自己的亂數產生器，不影響 random 模組的共用序列。
+    """
+    random.seed(11)
+    expected = random.random()
+    random.seed(11)
+    state = GameState(seed=1)
+    state.apply_move(Policies.random_walk(state, random.Random(0)))
+    state.undo()
+    state.redo()
+    assert random.random() == expected
+
+
+@pytest.mark.parametrize("outcome", ["lost", "won"])
+def test_finished_game_cannot_be_undone(outcome):
+    """
+    輸掉（或贏得）的對局不能以 undo / redo 撤銷結果後繼續拖曳。
+    """
+    state = GameState(seed=3)
+    rng = random.Random(3)
+    for _ in range(3):
+        state.apply_move(Policies.random_walk(state, rng))
+    assert state.undo()
+    if outcome == "lost":
+        while not state.finished:
+            state.step()
+    else:
+        state.won = True
+    before = state_hash(state)
+    assert not state.undo()
+    assert not state.redo()
+    assert state_hash(state) == before and state.finished
@@ -0,0 +1,67 @@
+import json
+import pytest
+from levels import LevelConfigError, compile_levels, load_levels
+
+
+def _level(**overrides):
+    level = {"enemy": "man", "health": 100, "size": [150, 200], "speed": 1.0}
+    level.update(overrides)
+    return {key: value for key, value in level.items() if value is not None}
+
+
+def test_speed_delta_is_relative_to_previous_level():
+    """
+    speed_delta 以前一關的速度為基準累加。
+    """
+    levels = [_level(), _level(speed=None, speed_delta=0.5), _level(speed=None, speed_delta=-0.25)]
+    table = compile_levels({"levels": levels})
+    assert [spec.speed for spec in table] == [1.0, 1.5, 1.25]
+    assert [spec.level for spec in table] == [1, 2, 3]
+    assert table[1].sprite == "level2_man"
+
+
+@pytest.mark.parametrize("config", [
+    None,
+    {},
+    {"levels": []},
+    {"levels": ["man"]},
+    {"levels": [_level(boss=True)]},
+    {"levels": [_level(enemy="")]},
+    {"levels": [_level(health=0)]},
+    {"levels": [_level(health=True)]},
+    {"levels": [_level(health=1.5)]},
+    {"levels": [_level(size=[150])]},
+    {"levels": [_level(size=[150, -1])]},
+    {"levels": [_level(speed="fast")]},
+    {"levels": [_level(speed=True)]},
+    {"levels": [_level(speed=0)]},
+    {"levels": [_level(speed=float("nan"))]},
+    {"levels": [_level(speed=float("inf"))]},
+    {"levels": [_level(speed_delta=0.5)]},
+    {"levels": [_level(speed=None)]},
+    {"levels": [_level(speed=None, speed_delta=1.0)]},
+    {"levels": [_level(), _level(speed=None, speed_delta=-1.0)]},
+    {"levels": [_level(speed=1e308), _level(speed=None, speed_delta=1e308)]},
+])
+def test_invalid_config_is_rejected(config):
+    """
+    不合法的關卡設定一律以 LevelConfigError 拒絕。
+    """
+    with pytest.raises(LevelConfigError):
+        compile_levels(config)
+
+
+def test_load_levels_reports_bad_files(tmp_path):
+    """
+    讀不到或不是 JSON 的設定檔同樣以 LevelConfigError 回報；NaN 這類 JSON 擴充值也會被拒絕。
+    """
+    with pytest.raises(LevelConfigError):
+        load_levels(str(tmp_path / "missing.json"))
+    path = tmp_path / "levels.json"
+    path.write_text("{levels:", encoding="utf-8")
+    with pytest.raises(LevelConfigError):
+        load_levels(str(path))
+    path.write_text(json.dumps({"levels": [_level()]}).replace("1.0", "NaN"), encoding="utf-8")
+    with pytest.raises(LevelConfigError):
+        load_levels(str(path))
+
@@ -0,0 +1,41 @@
+import csv
+import json
+from profiler import PHASES, FrameProfiler
+
+
+def _run(profiler, frames):
+    for index in range(frames):
+        profiler.current["board"] = float(index)
+        profiler.end_frame({"check_matches": index})
+
+
+def test_csv_trace_is_streamed(tmp_path):
+    """
+    CSV 紀錄每一幀結束就寫出，不在記憶體中累積整份紀錄。
+    """
+    path = tmp_path / "trace.csv"
+    profiler = FrameProfiler(trace_path=str(path))
+    _run(profiler, 2000)
+    assert not hasattr(profiler, "trace")
+    assert len(path.read_text(encoding="utf-8").splitlines()) > 1  # 關閉前已有資料寫入磁碟
+    profiler.close()
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 2000
+    assert [float(row["board"]) for row in rows[:3]] == [0.0, 1.0, 2.0]
+
+
+def test_json_trace_is_complete_after_close(tmp_path):
+    """
+    JSON 紀錄在 close() 後是完整的物件；沒有任何幀時 frames 為空列表。
+    """
+    path = tmp_path / "trace.json"
+    profiler = FrameProfiler(trace_path=str(path))
+    _run(profiler, 3)
+    profiler.close()
+    trace = json.loads(path.read_text(encoding="utf-8"))
+    assert trace["phases"] == list(PHASES)
+    assert [frame["board"] for frame in trace["frames"]] == [0.0, 1.0, 2.0]
+    empty = FrameProfiler(trace_path=str(path))
+    empty.close()
+    assert json.loads(path.read_text(encoding="utf-8"))["frames"] == []
@@ -0,0 +1,36 @@
+import random
+import pytest
+from simulate import Policies
+
+
+def test_dirty_rendering_matches_full_redraw(monkeypatch):
+    """
+    局部更新繪出的畫面與整張重畫逐像素相同。
+    """
+    pygame = pytest.importorskip("pygame")
+    pytest.importorskip("numpy")
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    import game
+
+    manager = game.GameManager(seed=1)
+    try:
+        state = manager.state
+        rng = random.Random(1)
+        for frame in range(200):
+            if frame % 7 == 0:
+                state.apply_move(Policies.random_walk(state, rng))
+            if frame % 50 == 10:
+                manager.hint = game.solve(state.board.tiles).path
+            elif frame % 50 == 30:
+                manager.hint = []
+            state.step()
+            if state.finished:
+                break
+            sprite = manager.images[state.spec.sprite]
+            manager._draw_dirty(sprite)
+            dirty = manager.screen.copy()
+            manager._draw_full(sprite)
+            assert (pygame.surfarray.array3d(dirty) == pygame.surfarray.array3d(manager.screen)).all(), frame
+    finally:
+        pygame.quit()
@@ -0,0 +1,103 @@
+import asyncio
+import random
+from server import Client, GameServer
+from simulate import Policies
+from state import GameState
+from stone_types import TYPE_CODES
+
+
+def _run(test):
+    """
+    以可控制的時鐘啟動伺服器（隨機埠），執行 test(server, port, now) 後關閉。
+    """
+    async def main():
+        now = [0.0]
+        server = GameServer(clock=lambda: now[0])
+        listener = await server.start(port=0)
+        try:
+            await test(server, listener.sockets[0].getsockname()[1], now)
+        finally:
+            server.stop()
+            listener.close()
+            await listener.wait_closed()
+    asyncio.run(main())
+
+
+def test_moves_match_a_local_game():
+    """
+    伺服器依自己的時鐘推進敵人；回傳的變動格子與狀態與本機以相同種子執行的對局一致。
+    """
+    async def test(server, port, now):
+        client = await Client.connect(port=port)
+        reply = await client.request(op="new", seed=42)
+        session, board = reply["session"], reply["board"]
+        local, rng = GameState(server.rows, server.cols, seed=42), random.Random(3)
+        assert board == [[TYPE_CODES[stone.type] for stone in row] for row in local.board.tiles]
+        for _ in range(30):
+            path = Policies.random_walk(local, rng)
+            frame = local.frame + 25
+            now[0] = frame / server.logic_hz
+            reply = await client.request(op="move", session=session, path=path)
+            while local.frame < frame and not local.finished:
+                local.step()
+            result = local.apply_move(path)
+            for row, col, code in reply["cells"]:
+                board[row][col] = code
+            assert board == [[TYPE_CODES[stone.type] for stone in row] for row in local.board.tiles]
+            assert (reply["damage"], reply["state"]["health"]) == (result.damage, local.health)
+            assert reply["state"]["frame"] == local.frame
+            if local.finished:
+                break
+        await client.close()
+    _run(test)
+
+
+def test_idle_client_cannot_stop_the_enemy():
+    """
+    客戶端不送請求時敵人照樣依伺服器時鐘前進，下一次拖曳時已經走出畫布。
+    """
+    async def test(server, port, now):
+        client = await Client.connect(port=port)
+        session = (await client.request(op="new", seed=1))["session"]
+        now[0] += 1000.0
+        reply = await client.request(op="move", session=session, path=[[0, 0], [0, 1]])
+        assert reply["state"]["lost"] and reply["damage"] == 0
+        await client.close()
+    _run(test)
+
+
+def test_sessions_belong_to_their_connection():
+    """
+    只有建立對局的連線可以操作它；格式不對的編號一律視為不存在；斷線時對局一併移除。
+    """
+    async def test(server, port, now):
+        owner, other = await Client.connect(port=port), await Client.connect(port=port)
+        session = (await owner.request(op="new", seed=5))["session"]
+        for op in ("move", "undo", "reset", "close"):
+            assert (await other.request(op=op, session=session, path=[[0, 0]]))["error"] == "unknown session"
+        for bad_id in (True, [session], str(session), float(session)):
+            assert (await owner.request(op="undo", session=bad_id))["error"] == "unknown session"
+        assert session in server.sessions
+        await owner.close()
+        await other.request(op="new", seed=6)  # 等伺服器處理完斷線
+        assert session not in server.sessions
+        await other.close()
+    _run(test)
+
+
+def test_invalid_paths_and_pending_moves_are_rejected():
+    """
+    路徑必須在盤面內且逐格相鄰；同一對局同時只能有一個尚未結算的拖曳。
+    """
+    async def test(server, port, now):
+        owned = set()
+        session = (await server.handle({"op": "new", "seed": 2}, owned))["session"]
+        too_long = [[0, 0], [0, 1]] * 100
+        for path in ([[0, 0], [1, 1]], [[0, 0], [0, server.cols]], [[0, True]], [[0]], "0,0", too_long):
+            reply = await server.handle({"op": "move", "session": session, "path": path}, owned)
+            assert reply == {"ok": False, "error": "invalid move"}
+        move = {"op": "move", "session": session, "path": [[0, 0], [0, 1]]}
+        first, second = await asyncio.gather(server.handle(move, owned), server.handle(move, owned))
+        assert first["ok"] and second == {"ok": False, "error": "a move is already pending"}
+        assert (await server.handle(move, owned))["ok"]
+    _run(test)
@@ -0,0 +1,37 @@
+import random
+from board import TileManager
+from solver import DragSolver, solve
+
+
+def _assert_valid_path(path, rows, cols):
+    assert all(0 <= row < rows and 0 <= col < cols for row, col in path)
+    for (row, col), (next_row, next_col) in zip(path, path[1:]):
+        assert abs(row - next_row) + abs(col - next_col) == 1  # 每一步只移到上下左右相鄰的格子
+
+
+def test_solution_path_is_valid_and_scored_honestly():
+    """
+    解答路徑由相鄰格子組成、從允許的起點出發，且照著路徑拖曳後的評分與回報的傷害與 combo 相同。
+    """
+    rows, cols = 5, 6
+    for seed in range(20):
+        tiles = TileManager.generate_board(rows, cols, seed)
+        starts = [(random.Random(seed).randrange(rows), col) for col in range(cols)]
+        solution = solve(tiles, time_budget=float("inf"), starts=starts)
+        assert solution.path and solution.damage > 0
+        assert solution.path[0] in starts
+        _assert_valid_path(solution.path, rows, cols)
+        moved = [list(row) for row in tiles]
+        TileManager.apply_path(moved, solution.path)
+        solver = DragSolver(rows, cols)
+        assert solver.evaluate(solver.encode(moved)) == (solution.damage, solution.combo)
+
+
+def test_no_possible_match_returns_empty_solution():
+    """
+    任何拖曳都無法造成消除時回傳空路徑，而不是零傷害的路徑。
+    """
+    # 每種符石最多兩顆，怎麼拖曳都連不成三顆
+    tiles = TileManager.decode_tiles(bytes([0, 0, 1, 1, 2, 2, 3, 3, 4]), 3, 3)
+    solution = solve(tiles, time_budget=float("inf"))
+    assert (solution.path, solution.damage, solution.combo) == ([], 0, 0)
@@ -0,0 +1,22 @@
+import random
+import pytest
+from replay import state_hash
+from simulate import Policies
+from state import GameState
+
+
+@pytest.mark.parametrize("outcome", ["lost", "won"])
+def test_finished_game_ignores_moves(outcome):
+    """
+    勝負已定後的拖曳不會交換符石，也不會改變任何狀態。
+    """
+    state = GameState(seed=4)
+    if outcome == "lost":
+        while not state.finished:
+            state.step()
+    else:
+        state.won = True
+    before = state_hash(state)
+    result = state.apply_move(Policies.random_walk(state, random.Random(4)))
+    assert result.cascade == [] and result.damage == 0 and not result.killed
+    assert state_hash(state) == before
@@ -1,33 +1,80 @@
 import pygame
-from typing import Dict
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+Colour = Tuple[int, int, int]
+
+
+class RenderCache:
+    """
+    HUD 繪製用的快取：每種字級共用一個 Font，
+    以及依 (字串, 顏色, 字級) 記憶的文字 Surface（LRU 淘汰）。
+    """
+
+    def __init__(self, max_texts: int = 256) -> None:
+        """
+        :param max_texts: 文字 Surface 快取的上限，超過時淘汰最久未使用的項目
+        """
+        self.max_texts: int = max_texts
+        self.fonts: Dict[int, pygame.font.Font] = {}
+        self.texts: "OrderedDict[Tuple[str, Colour, int], pygame.Surface]" = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def font(self, size: int) -> pygame.font.Font:
+        """
+        回傳指定字級的共用預設字型。
+        """
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def text(self, string: str, colour: Colour, size: int) -> pygame.Surface:
+        """
+        回傳已繪製的文字 Surface，內容未變時直接重用。
+        """
+        key = (string, tuple(colour), size)
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.texts.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = self.texts[key] = self.font(size).render(string, True, colour)
+        if len(self.texts) > self.max_texts:
+            self.texts.popitem(last=False)
+        return surface
+
+    def stats(self) -> Dict[str, int]:
+        """
+        回傳快取命中與未命中次數。
+        """
+        return {"hits": self.hits, "misses": self.misses, "texts": len(self.texts)}
+
+    def clear(self) -> None:
+        """
+        清空所有快取與計數（pygame 重新初始化後舊的 Font 與 Surface 都不能再用）。
+        """
+        self.fonts.clear()
+        self.texts.clear()
+        self.hits = self.misses = 0
+
+
+render_cache: RenderCache = RenderCache()  # HUD 共用的繪製快取
 
 
 class ImageManager:
     @staticmethod
-    def load_images(image_path: Dict[str, str], tile_size: int, screen_width: int, screen_height: int) -> Dict[str, pygame.Surface]:
-        """
-        加載並縮放所有遊戲所需的圖片。
-        :param image_path: 字典，包含圖片名稱與對應路徑
-        :param tile_size: 符石的圖片大小
-        :param screen_width: 螢幕寬度，用於背景圖片的縮放
-        :param screen_height: 螢幕高度，用於背景圖片的縮放
-        :return: 字典，包含已縮放的圖片資源
-        """
-        images: Dict[str, pygame.Surface] = {}
-        for key, path in image_path.items():
-            if key in ["background", "victory"]:
-                images[key] = pygame.transform.scale(
-                    pygame.image.load(path), (screen_width, screen_height if key == "victory" else 300)
-                )
-            elif key == "start_background":
-                images[key] = pygame.transform.scale(
-                    pygame.image.load(path), (screen_width, screen_height)
-                )
-            else:
-                images[key] = pygame.transform.scale(
-                    pygame.image.load(path), (tile_size, tile_size)
-                )
-        return images
+    def target_size(key: str, tile_size: int, screen_width: int, screen_height: int) -> Tuple[int, int]:
+        """
+        回傳每張圖片縮放後的尺寸：背景固定高 300，全螢幕畫面與畫布同大，其餘為符石大小。
+        """
+        if key == "background":
+            return screen_width, 300
+        if key in ["victory", "start_background", "lose"]:
+            return screen_width, screen_height
+        return tile_size, tile_size
 
 
 class HealthBar:
@@ -45,11 +92,19 @@ class HealthBar:
         """
         pygame.draw.rect(screen, (255, 255, 255), (x, y, width, height))
         pygame.draw.rect(screen, (255, 0, 0), (x, y, width * (health / max_health), height))
-        font = pygame.font.Font(None, 24)
-        health_text = font.render(f"{health}/{max_health}", True, (0, 0, 0))
+        health_text = render_cache.text(f"{health}/{max_health}", (0, 0, 0), 24)
         text_rect = health_text.get_rect(center=(x + width // 2, y + height // 2))
         screen.blit(health_text, text_rect)
 
+    @staticmethod
+    def bounds(health: int, max_health: int, x: int, y: int, width: int, height: int) -> pygame.Rect:
+        """
+        計算血條與數字文字在畫布上佔用的區域（用於局部更新）。
+        """
+        text_rect = pygame.Rect((0, 0), render_cache.font(24).size(f"{health}/{max_health}"))
+        text_rect.center = (x + width // 2, y + height // 2)
+        return pygame.Rect(x, y, width, height).union(text_rect)
+
 
 class StatusBar:
     @staticmethod
@@ -61,11 +116,25 @@ class StatusBar:
         :param combo: 當前的連擊數
         :param level: 當前關卡
         """
-        font = pygame.font.Font(None, 36)
-        texts = [
+        for i, text in enumerate(StatusBar._texts(traffic_tickets, combo, level)):
+            screen.blit(render_cache.text(text, (255, 255, 255), 36), (20, 20 + i * 60))
+
+    @staticmethod
+    def bounds(traffic_tickets: int, combo: int, level: int) -> pygame.Rect:
+        """
+        計算狀態欄文字在畫布上佔用的區域（用於局部更新）。
+        """
+        font = render_cache.font(36)
+        rects = [
+            pygame.Rect((20, 20 + i * 60), font.size(text))
+            for i, text in enumerate(StatusBar._texts(traffic_tickets, combo, level))
+        ]
+        return rects[0].unionall(rects[1:])
+
+    @staticmethod
+    def _texts(traffic_tickets: int, combo: int, level: int) -> List[str]:
+        return [
             f"Traffic Tickets: {traffic_tickets}",
             f"Combo: {combo}",
             f"Level: {level}"
         ]
-        for i, text in enumerate(texts):
-            screen.blit(font.render(text, True, (255, 255, 255)), (20, 20 + i * 60))